@@ -1,5 +1,9 @@
 import os
 import re
+from concurrent.futures import ThreadPoolExecutor
+
+from mdx_frontmatter import read_frontmatter
+from scan_tree import iter_mdx
 
 
 WORKING_DIRS = [
@@ -7,9 +11,26 @@ WORKING_DIRS = [
 	"rediq",
 ]
 
+# Files are independent; threads overlap the per-file read/write latency
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Prefer removing common long words that don't add much in sidebar labels.
+# One alternation, longest phrase first so "Report Overview" wins over "Report".
+_STOPWORDS_RE = re.compile(
+	r"\b(?:Report Overview|Overview|Report|Video|Tutorials|Tutorial|Guide|Beta)\b",
+	re.IGNORECASE,
+)
+
+# Dashes become spaces; the whitespace around them is collapsed afterwards
+_SEP_TABLE = str.maketrans({"-": " ", "–": " ", "—": " "})
 
-def read_text(file_path: str) -> str:
+# First "title:" line, indented or not, as upsert_sidebar_title finds it
+_TITLE_LINE_RE = re.compile(r"^[\t ]*title:(.*)$", re.MULTILINE)
+
+
+def read_body(file_path: str, body_offset: int) -> str:
 	with open(file_path, "r", encoding="utf-8") as f:
+		f.seek(body_offset)
 		return f.read()
 
 
@@ -18,44 +39,17 @@ def write_text(file_path: str, content: str) -> None:
 		f.write(content)
 
 
-def extract_frontmatter(content: str):
-	# Matches frontmatter delimited by '---' at the start of the file
-	match = re.match(r"^---\r?\n([\s\S]*?)\r?\n---\r?\n", content)
-	if not match:
-		return None, None, None
-	start, end = match.span()
-	frontmatter = match.group(1)
-	body = content[end:]
-	return frontmatter, start, body
-
-
-def get_yaml_value_block(yaml_text: str, key: str):
-	# Capture lines like: key: value
-	pattern = re.compile(rf"^(?P<indent>[\t ]*){re.escape(key)}:\s*(?P<value>.*)$", re.MULTILINE)
-	return pattern.search(yaml_text)
-
-
 def clean_title_for_sidebar(title: str) -> str:
 	original = title.strip()
-	# Prefer removing common long words that don't add much in sidebar labels
-	replacements = [
-		("Report Overview", ""),
-		("Overview", ""),
-		("Report", ""),
-		("Video", ""),
-		("Tutorials", ""),
-		("Tutorial", ""),
-		("Guide", ""),
-		("Beta", ""),
-	]
-	s = original
-	for old, new in replacements:
-		s = re.sub(rf"\b{re.escape(old)}\b", new, s, flags=re.IGNORECASE)
-
-	# Normalize separators and whitespace
-	s = re.sub(r"\s*[-–—]\s*", " ", s)
-	s = re.sub(r"\s+/\s+", "/", s)
-	s = re.sub(r"\s+", " ", s).strip(" -–—:;.,\t\n\r")
+	s = _STOPWORDS_RE.sub("", original)
+
+	# Normalize separators and whitespace; keep a single edge space so " / " still
+	# only collapses when the slash had whitespace on both sides
+	s = s.translate(_SEP_TABLE)
+	lead = " " if s[:1].isspace() else ""
+	trail = " " if s[-1:].isspace() else ""
+	s = lead + " ".join(s.split()) + trail
+	s = s.replace(" / ", "/").strip(" -–—:;.,\t\n\r")
 
 	# If removal made it empty, fall back to original
 	if not s:
@@ -95,93 +89,105 @@ def ensure_quoted(value: str) -> str:
 	return f'"{escaped}"'
 
 
-def upsert_sidebar_title(frontmatter: str) -> str:
-	# Find title
-	title_match = get_yaml_value_block(frontmatter, "title")
-	if not title_match:
-		return frontmatter  # no title; do nothing
+def unquote(value: str) -> str:
+	if (value.startswith('"') and value.endswith('"')) or (value.startswith("'") and value.endswith("'")):
+		return value[1:-1]
+	return value
 
-	title_line = title_match.group(0)
-	title_value = title_match.group("value").strip()
 
-	# Strip quotes if present
-	if (title_value.startswith('"') and title_value.endswith('"')) or (
-			title_value.startswith("'") and title_value.endswith("'")
-	):
-		title_value_unquoted = title_value[1:-1]
-	else:
-		title_value_unquoted = title_value
+def upsert_sidebar_title(frontmatter: str) -> str:
+	# Single scan over the YAML lines to locate title and sidebarTitle
+	lines = frontmatter.split("\n")
+	title_value = None
+	sidebar_value = None
+	top_title_idx = -1
+	top_sidebar_idxs = []
+	for idx, line in enumerate(lines):
+		stripped = line.lstrip("\t ")
+		if stripped.startswith("title:"):
+			if title_value is None:
+				title_value = stripped[6:].strip()
+			if top_title_idx == -1 and line.startswith("title:"):
+				top_title_idx = idx
+		elif stripped.startswith("sidebarTitle:"):
+			if sidebar_value is None:
+				sidebar_value = stripped[13:].strip()
+			if line.startswith("sidebarTitle:"):
+				top_sidebar_idxs.append(idx)
+
+	if title_value is None:
+		return frontmatter  # no title; do nothing
 
-	# If title fits, no need to add sidebarTitle unless one already exists and violates length
-	sidebar_match = get_yaml_value_block(frontmatter, "sidebarTitle")
+	title_value_unquoted = unquote(title_value)
 
-	def apply_set(sidebar_text: str) -> str:
+	def apply_set(has_sidebar: bool) -> str:
 		label = clean_title_for_sidebar(title_value_unquoted)
-		quoted_label = ensure_quoted(label)
-		if sidebar_text:
-			return re.sub(r"^sidebarTitle:\s*.*$", f"sidebarTitle: {quoted_label}", frontmatter, flags=re.MULTILINE)
+		sidebar_line = f"sidebarTitle: {ensure_quoted(label)}"
+		if has_sidebar:
+			# Only top-level sidebarTitle keys are rewritten
+			for idx in top_sidebar_idxs:
+				lines[idx] = sidebar_line
+			return "\n".join(lines)
 		# Insert sidebarTitle before title line if possible
-		lines = frontmatter.splitlines()
-		for idx, line in enumerate(lines):
-			if re.match(r"^title:\s*", line):
-				lines.insert(idx, f"sidebarTitle: {quoted_label}")
-				return "\n".join(lines)
+		if top_title_idx != -1:
+			lines.insert(top_title_idx, sidebar_line)
+			return "\n".join(lines)
 		# If no explicit title line match (unlikely), append at end
-		return frontmatter.rstrip() + f"\nsidebarTitle: {quoted_label}\n"
+		return frontmatter.rstrip() + f"\n{sidebar_line}\n"
 
 	# Decide whether to set/update sidebarTitle
 	if len(title_value_unquoted) > 28:
-		return apply_set(sidebar_match.group(0) if sidebar_match else None)
+		return apply_set(sidebar_value is not None)
 
 	# If title <= 28, only adjust if an existing sidebarTitle exceeds 28
-	if sidebar_match:
-		sidebar_value = sidebar_match.group("value").strip()
-		if (sidebar_value.startswith('"') and sidebar_value.endswith('"')) or (
-				sidebar_value.startswith("'") and sidebar_value.endswith("'")
-		):
-			sidebar_unquoted = sidebar_value[1:-1]
-		else:
-			sidebar_unquoted = sidebar_value
-		if len(sidebar_unquoted) > 28:
-			return apply_set(sidebar_match.group(0))
+	if sidebar_value is not None and len(unquote(sidebar_value)) > 28:
+		return apply_set(True)
 
 	return frontmatter
 
 
 def process_file(path: str) -> bool:
-	content = read_text(path)
-	frontmatter, start, body = extract_frontmatter(content)
+	frontmatter, body_offset = read_frontmatter(path)
 	if frontmatter is None:
 		return False
 
+	# Without a sidebarTitle only a title longer than 28 characters needs a change,
+	# so most files are rejected here before the full frontmatter scan
+	if "sidebarTitle:" not in frontmatter:
+		match = _TITLE_LINE_RE.search(frontmatter)
+		if match is None or len(unquote(match.group(1).strip())) <= 28:
+			return False
+
 	updated_frontmatter = upsert_sidebar_title(frontmatter)
 	if updated_frontmatter == frontmatter:
 		return False
 
+	# Body is only loaded once we know the file needs rewriting
+	body = read_body(path, body_offset)
 	new_content = "---\n" + updated_frontmatter + "\n---\n" + body
 	write_text(path, new_content)
 	return True
 
 
-def is_mdx_file(filename: str) -> bool:
-	return filename.lower().endswith(".mdx")
-
-
 def main() -> None:
-	updated_files = []
+	all_paths = []
 	for base in WORKING_DIRS:
 		if not os.path.isdir(base):
 			continue
-		for root, _dirs, files in os.walk(base):
-			for file in files:
-				if not is_mdx_file(file):
-					continue
-				full_path = os.path.join(root, file)
-				try:
-					if process_file(full_path):
-						updated_files.append(full_path)
-				except Exception as e:
-					print(f"[ERROR] {full_path}: {e}")
+		all_paths.extend(iter_mdx(base))
+
+	def try_process(full_path: str) -> bool:
+		try:
+			return process_file(full_path)
+		except Exception as e:
+			print(f"[ERROR] {full_path}: {e}")
+			return False
+
+	updated_files = []
+	with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+		for full_path, updated in zip(all_paths, executor.map(try_process, all_paths)):
+			if updated:
+				updated_files.append(full_path)
 
 	if updated_files:
 		print(f"Updated {len(updated_files)} files:")
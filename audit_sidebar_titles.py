@@ -1,24 +1,23 @@
 import os
 import re
 
-
-TARGET_DIRS = ["radix", "rediq"]
+from mdx_frontmatter import read_frontmatter
+from scan_tree import iter_mdx
 
 
-def read_text(path: str) -> str:
-	with open(path, "r", encoding="utf-8") as f:
-		return f.read()
-
+TARGET_DIRS = ["radix", "rediq"]
 
-def extract_frontmatter(content: str):
-	match = re.match(r"^---\r?\n([\s\S]*?)\r?\n---\r?\n", content)
-	if not match:
-		return None
-	return match.group(1)
+_YAML_KEY_RES = {
+	key: re.compile(rf"^(?P<i>[\t ]*){re.escape(key)}:\s*(?P<v>.*)$", re.MULTILINE)
+	for key in ("title", "sidebarTitle")
+}
 
 
 def get_yaml_value(yaml_text: str, key: str):
-	m = re.search(rf"^(?P<i>[\t ]*){re.escape(key)}:\s*(?P<v>.*)$", yaml_text, re.MULTILINE)
+	pattern = _YAML_KEY_RES.get(key)
+	if pattern is None:
+		pattern = re.compile(rf"^(?P<i>[\t ]*){re.escape(key)}:\s*(?P<v>.*)$", re.MULTILINE)
+	m = pattern.search(yaml_text)
 	return None if not m else m.group("v").strip()
 
 
@@ -36,23 +35,19 @@ def find_issues():
 	for base in TARGET_DIRS:
 		if not os.path.isdir(base):
 			continue
-		for root, _dirs, files in os.walk(base):
-			for file in files:
-				if not file.lower().endswith(".mdx"):
+		for path in iter_mdx(base):
+			try:
+				fm, _body_offset = read_frontmatter(path)
+				if fm is None:
 					continue
-				path = os.path.join(root, file)
-				try:
-					fm = extract_frontmatter(read_text(path))
-					if fm is None:
-						continue
-					title = unquote(get_yaml_value(fm, "title") or "")
-					sidebar = unquote(get_yaml_value(fm, "sidebarTitle") or "")
-					if len(title) > 28 and not sidebar:
-						missing_sidebar.append((path, len(title), title))
-					elif sidebar and len(sidebar) > 28:
-						too_long_sidebar.append((path, len(sidebar), sidebar))
-				except Exception:
-					pass
+				title = unquote(get_yaml_value(fm, "title") or "")
+				sidebar = unquote(get_yaml_value(fm, "sidebarTitle") or "")
+				if len(title) > 28 and not sidebar:
+					missing_sidebar.append((path, len(title), title))
+				elif sidebar and len(sidebar) > 28:
+					too_long_sidebar.append((path, len(sidebar), sidebar))
+			except Exception:
+				pass
 	return missing_sidebar, too_long_sidebar
 
 
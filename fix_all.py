@@ -0,0 +1,454 @@
+#!/usr/bin/env python3
+"""
+Combined script to fix kb://article/ links and .mdx link extensions in MDX files.
+
+Each MDX file is read once, every requested fix is applied to the in-memory
+content, and the file is written back once. The older fix_broken_links.py,
+fix_broken_links_comprehensive.py, fix_mdx_extensions.py and
+fix_mdx_extensions_simple.py scripts are thin wrappers around main(mode=...).
+
+Modes:
+- links: replace kb://article/ links with relative paths (keeps .mdx)
+- links-comprehensive: same, without .mdx, plus a detailed report
+- extensions: remove .mdx from anything ending in .mdx)
+- extensions-simple: remove .mdx from [text](path.mdx) markdown links only
+- all: links-comprehensive and extensions-simple in a single pass
+"""
+
+import argparse
+import json
+import mmap
+import os
+import pickle
+import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+
+import scan_tree
+
+try:
+    import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+    _json_fast = None
+
+_json_loads = _json_fast.loads if _json_fast is not None else json.loads
+
+LINKS = 'links'
+LINKS_COMPREHENSIVE = 'links-comprehensive'
+EXTENSIONS = 'extensions'
+EXTENSIONS_SIMPLE = 'extensions-simple'
+ALL = 'all'
+MODES = (LINKS, LINKS_COMPREHENSIVE, EXTENSIONS, EXTENSIONS_SIMPLE, ALL)
+
+# Configuration
+ARTICLES_JSONL = r"C:\Users\BenBeggs\Downloads\articles.jsonl"
+DOCS_DIR = r"C:\Users\BenBeggs\Documents\GitHub\docs"
+REPORT_FILE = "link_fix_report.txt"
+
+# On-disk cache of the articles mapping and slug indexes, reused across runs
+INDEX_CACHE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '.link_index.pkl')
+
+# Per-file work is independent read -> substitute -> write, so overlap the I/O
+MAX_WORKERS = min(32, (os.cpu_count() or 1) * 4)
+
+# Pattern to match kb://article/ links
+_KB_LINK_RE = re.compile(r'kb://article/([^)\s]+)')
+
+# Pattern to match anything ending with .mdx)
+_MDX_ANY_LINK_RE = re.compile(r'([^)]+)\.mdx\)')
+
+# Very specific pattern to match ONLY markdown links ending with .mdx)
+# This looks for [text](path.mdx) pattern - actual markdown links
+# The pattern ensures we have:
+# 1. [text] - link text in brackets
+# 2. (path.mdx) - path in parentheses ending with .mdx
+_MDX_LINK_RE = re.compile(r'(\[[^\]]+\]\()([^)]+)\.mdx\)')
+
+# Byte strings a file must contain for a mode to have anything to fix;
+# checked before decoding so files without them are never decoded at all
+_SENTINELS = {
+    LINKS: (b'kb://article/',),
+    LINKS_COMPREHENSIVE: (b'kb://article/',),
+    EXTENSIONS: (b'.mdx)',),
+    EXTENSIONS_SIMPLE: (b'.mdx)',),
+    ALL: (b'kb://article/', b'.mdx)'),
+}
+
+def load_articles_mapping(jsonl_file):
+    """Load articles.jsonl and create a mapping from article_id to slug.
+
+    The file is memory-mapped and scanned as bytes, so lines are never
+    decoded to str before being handed to the JSON parser.
+    """
+    mapping = {}
+
+    with open(jsonl_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return mapping  # mmap cannot map an empty file
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            for line in iter(mm.readline, b''):
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    article = _json_loads(line)
+                except json.JSONDecodeError:
+                    print(f"Warning: Could not parse JSON line: {line[:100].decode('utf-8', 'replace')}...")
+                    continue
+                article_id = article.get('article_id')
+                slug = article.get('slug')
+                if article_id and slug:
+                    mapping[article_id] = slug
+        finally:
+            mm.close()
+
+    return mapping
+
+def iter_mdx(base_dir):
+    """Yield paths of all MDX files under base_dir, skipping dot-entries as glob's "**" did."""
+    return scan_tree.iter_mdx(base_dir, skip_hidden=True)
+
+def build_slug_index(base_dir, mdx_files=None):
+    """Map lowercase MDX filename stems to paths relative to base_dir.
+
+    Built once per run so slug lookups are dict accesses instead of
+    recursive globs over the whole docs tree. Pass the already-discovered
+    relative paths in mdx_files to avoid walking the tree a second time.
+    """
+    if mdx_files is None:
+        mdx_files = [os.path.relpath(p, base_dir) for p in iter_mdx(base_dir)]
+    slug_index = {}
+    for rel_path in mdx_files:
+        stem = os.path.splitext(os.path.basename(rel_path))[0].lower()
+        slug_index.setdefault(stem, rel_path)
+    return slug_index
+
+def build_substring_index(slug_index):
+    """Build a trigram index over the slug index for the "name contains slug" fallback.
+
+    Returns {'stems': [(stem, rel_path), ...], 'trigrams': {trigram: [position, ...]}}
+    with positions ascending, so the first hit matches slug_index order.
+    """
+    stems = list(slug_index.items())
+    trigrams = defaultdict(list)
+    for pos, (stem, _rel_path) in enumerate(stems):
+        for gram in {stem[i:i + 3] for i in range(len(stem) - 2)}:
+            trigrams[gram].append(pos)
+    for postings in trigrams.values():
+        postings.sort()
+    return {'stems': stems, 'trigrams': dict(trigrams)}
+
+def load_or_build_index(articles_jsonl, docs_dir, mdx_files=None):
+    """Return (articles_mapping, slug_index, substring_index), cached in INDEX_CACHE.
+
+    The cache is keyed on the articles.jsonl mtime and size plus the list of
+    MDX files under docs_dir, so it is reused only when neither has changed.
+    A missing, stale or unreadable cache is rebuilt and rewritten.
+    """
+    if mdx_files is None:
+        mdx_files = [os.path.relpath(p, docs_dir) for p in iter_mdx(docs_dir)]
+    st = os.stat(articles_jsonl)
+    key = (os.path.abspath(articles_jsonl), st.st_mtime_ns, st.st_size,
+           os.path.abspath(docs_dir), tuple(mdx_files))
+
+    try:
+        with open(INDEX_CACHE, 'rb') as f:
+            cached = pickle.load(f)
+        if cached.get('key') == key:
+            return cached['am'], cached['si'], cached['sub']
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        print(f"Warning: ignoring unreadable index cache {INDEX_CACHE}: {e}")
+
+    articles_mapping = load_articles_mapping(articles_jsonl)
+    slug_index = build_slug_index(docs_dir, mdx_files)
+    substring_index = build_substring_index(slug_index)
+
+    tmp_path = INDEX_CACHE + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            pickle.dump({'key': key, 'am': articles_mapping, 'si': slug_index, 'sub': substring_index},
+                        f, protocol=5)
+        os.replace(tmp_path, INDEX_CACHE)
+    except OSError as e:
+        print(f"Warning: could not write index cache {INDEX_CACHE}: {e}")
+
+    return articles_mapping, slug_index, substring_index
+
+def _substring_lookup(slug, slug_index, substring_index=None):
+    """Return the first indexed file whose name contains the slug."""
+    needle = slug.lower()
+    if substring_index is None or len(needle) < 3:
+        for stem, rel_path in slug_index.items():
+            if needle in stem:
+                return rel_path
+        return None
+
+    # Only stems sharing the needle's rarest trigram can contain it
+    trigrams = substring_index['trigrams']
+    postings = None
+    for i in range(len(needle) - 2):
+        candidates = trigrams.get(needle[i:i + 3])
+        if not candidates:
+            return None
+        if postings is None or len(candidates) < len(postings):
+            postings = candidates
+    stems = substring_index['stems']
+    for pos in postings:
+        stem, rel_path = stems[pos]
+        if needle in stem:
+            return rel_path
+    return None
+
+def find_mdx_file_by_slug(slug, slug_index, substring_index=None):
+    """Find the MDX file that matches the given slug."""
+    # Exact filename match first, then any file that contains the slug in its name
+    return slug_index.get(slug.lower()) or _substring_lookup(slug, slug_index, substring_index)
+
+def new_link_stats():
+    """Return an empty per-file link statistics dict."""
+    return {
+        'fixed_links': 0,
+        'unfound_files': defaultdict(int),
+        'unfound_article_ids': set(),
+        'unmapped_article_ids': set(),
+    }
+
+def merge_link_stats(stats, file_stats):
+    """Fold one file's link statistics into the run totals."""
+    stats['fixed_links'] += file_stats['fixed_links']
+    for slug, count in file_stats['unfound_files'].items():
+        stats['unfound_files'][slug] += count
+    stats['unfound_article_ids'].update(file_stats['unfound_article_ids'])
+    stats['unmapped_article_ids'].update(file_stats['unmapped_article_ids'])
+
+def decode_mdx(raw):
+    """Decode MDX bytes as UTF-8, falling back to latin-1, with universal newlines."""
+    try:
+        content = raw.decode('utf-8')
+    except UnicodeDecodeError:
+        content = raw.decode('latin-1')
+    # Match what text-mode reading did before: \r\n and \r become \n (and
+    # write_text_atomic writes in text mode, so Windows gets \r\n back)
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+def write_text_atomic(file_path, content):
+    """Write content via a temp file and os.replace so a crash never leaves a partial file."""
+    tmp_path = file_path + '.tmp'
+    try:
+        with open(tmp_path, 'w', encoding='utf-8', buffering=131072) as f:
+            f.write(content)
+        os.replace(tmp_path, file_path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+@lru_cache(maxsize=None)
+def relative_link(file_dir, target_file_path):
+    """Return target_file_path relative to file_dir with forward slashes.
+
+    Cached because every file in a directory links to the same small set of
+    targets; raises ValueError when the paths are on different drives.
+    """
+    relative_path = os.path.relpath(target_file_path, file_dir)
+    # Convert Windows path separators to forward slashes for web compatibility
+    return relative_path.replace('\\', '/')
+
+def fix_kb_links(content, file_path, articles_mapping, slug_index, base_dir, stats,
+                 strip_ext=True, verbose=False, substring_index=None):
+    """Replace kb://article/ links with paths relative to file_path.
+
+    Returns (content, number_of_links_rewritten); unresolved links are left as-is
+    and not counted, so a non-zero count always means the content changed.
+    """
+    fixed_before = stats['fixed_links']
+    current_file_dir = os.path.dirname(file_path)
+
+    def replace_link(match):
+        article_id = match.group(1)
+
+        if article_id in articles_mapping:
+            slug = articles_mapping[article_id]
+            mdx_file = find_mdx_file_by_slug(slug, slug_index, substring_index)
+
+            if mdx_file:
+                # Convert to relative path from the current file
+                target_file_path = os.path.join(base_dir, mdx_file)
+
+                # Calculate relative path
+                try:
+                    relative_path = relative_link(current_file_dir, target_file_path)
+
+                    # Remove .mdx extension for proper markdown links
+                    if strip_ext and relative_path.endswith('.mdx'):
+                        relative_path = relative_path[:-4]
+
+                    stats['fixed_links'] += 1
+                    return relative_path
+                except ValueError:
+                    # If files are on different drives, use absolute path
+                    if strip_ext and mdx_file.endswith('.mdx'):
+                        mdx_file = mdx_file[:-4]
+                    stats['fixed_links'] += 1
+                    return f"/{mdx_file}"
+            else:
+                if verbose:
+                    print(f"Warning: Could not find MDX file for slug '{slug}' (article_id: {article_id})")
+                stats['unfound_files'][slug] += 1
+                stats['unfound_article_ids'].add(article_id)
+                return match.group(0)  # Keep original if no match found
+        else:
+            if verbose:
+                print(f"Warning: Article ID '{article_id}' not found in articles mapping")
+            stats['unmapped_article_ids'].add(article_id)
+            return match.group(0)  # Keep original if not in mapping
+
+    content = _KB_LINK_RE.sub(replace_link, content)
+    return content, stats['fixed_links'] - fixed_before
+
+def strip_mdx_extensions(content, markdown_links_only=True):
+    """Remove .mdx from link targets. Returns (content, number_of_links_rewritten)."""
+    # C-level substring search rejects most files before the regex runs
+    if '.mdx)' not in content:
+        return content, 0
+    if markdown_links_only:
+        return _MDX_LINK_RE.subn(r'\1\2)', content)
+    return _MDX_ANY_LINK_RE.subn(r'\1)', content)
+
+def transform(content, mode, file_path, articles_mapping, slug_index, base_dir, stats, substring_index=None):
+    """Apply every fix selected by mode to content. Returns (content, number_of_links_rewritten)."""
+    total = 0
+    if mode in (LINKS, LINKS_COMPREHENSIVE, ALL):
+        content, n = fix_kb_links(
+            content,
+            file_path,
+            articles_mapping,
+            slug_index,
+            base_dir,
+            stats,
+            strip_ext=mode != LINKS,
+            verbose=mode == LINKS,
+            substring_index=substring_index,
+        )
+        total += n
+    if mode in (EXTENSIONS, EXTENSIONS_SIMPLE, ALL):
+        content, n = strip_mdx_extensions(content, markdown_links_only=mode != EXTENSIONS)
+        total += n
+    return content, total
+
+def fix_file(file_path, mode, articles_mapping, slug_index, base_dir, stats, substring_index=None):
+    """Read, fix and write back a single MDX file. Returns True if it was modified."""
+    with open(file_path, 'rb') as f:
+        raw = f.read()
+    if not any(sentinel in raw for sentinel in _SENTINELS[mode]):
+        return False
+    content = decode_mdx(raw)
+
+    new_content, n = transform(
+        content, mode, file_path, articles_mapping, slug_index, base_dir, stats, substring_index
+    )
+    # Every counted rewrite changes the text, so no full-string compare is needed
+    if n == 0:
+        return False
+
+    try:
+        write_text_atomic(file_path, new_content)
+        return True
+    except Exception as e:
+        print(f"Error writing {file_path}: {e}")
+        return False
+
+def print_link_report(stats):
+    """Print the link summary and save it to REPORT_FILE."""
+    print(f"Total links fixed: {stats['fixed_links']}")
+
+    sections = []
+    if stats['unfound_files']:
+        sections.append(("UNFOUND FILES", [
+            f"{slug}: {count} references"
+            for slug, count in sorted(stats['unfound_files'].items(), key=lambda x: x[1], reverse=True)
+        ]))
+    if stats['unfound_article_ids']:
+        sections.append(("UNFOUND ARTICLE IDs", sorted(stats['unfound_article_ids'])))
+    if stats['unmapped_article_ids']:
+        sections.append(("UNMAPPED ARTICLE IDs", sorted(stats['unmapped_article_ids'])))
+
+    for title, lines in sections:
+        print(f"\n=== {title} ===")
+        for line in lines:
+            print(f"  {line}")
+
+    # Save detailed report
+    with open(REPORT_FILE, 'w', encoding='utf-8') as f:
+        f.write("=== LINK FIX REPORT ===\n\n")
+        f.write(f"Files processed: {stats['files_processed']}\n")
+        f.write(f"Files modified: {stats['files_modified']}\n")
+        f.write(f"Total links fixed: {stats['fixed_links']}\n\n")
+        for title, lines in sections:
+            f.write(f"=== {title} ===\n")
+            for line in lines:
+                f.write(f"  {line}\n")
+            f.write("\n")
+
+    print(f"\nDetailed report saved to: {REPORT_FILE}")
+
+def main(mode=ALL, articles_jsonl=ARTICLES_JSONL, docs_dir=DOCS_DIR):
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode {mode!r}; expected one of {', '.join(MODES)}")
+    fixes_links = mode in (LINKS, LINKS_COMPREHENSIVE, ALL)
+
+    # Find all MDX files
+    mdx_files = [os.path.relpath(p, docs_dir) for p in iter_mdx(docs_dir)]
+    print(f"Found {len(mdx_files)} MDX files")
+
+    articles_mapping, slug_index, substring_index = {}, {}, None
+    if fixes_links:
+        print("Loading articles mapping...")
+        articles_mapping, slug_index, substring_index = load_or_build_index(articles_jsonl, docs_dir, mdx_files)
+        print(f"Loaded {len(articles_mapping)} article mappings")
+
+    stats = new_link_stats()
+    stats['files_processed'] = 0
+    stats['files_modified'] = 0
+
+    # Each worker gets its own stats dict; totals are merged on the main thread
+    def process(mdx_file):
+        file_stats = new_link_stats()
+        full_path = os.path.join(docs_dir, mdx_file)
+        modified = fix_file(full_path, mode, articles_mapping, slug_index, docs_dir, file_stats, substring_index)
+        return modified, file_stats
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for mdx_file, (modified, file_stats) in zip(mdx_files, executor.map(process, mdx_files)):
+            stats['files_processed'] += 1
+            merge_link_stats(stats, file_stats)
+
+            if modified:
+                stats['files_modified'] += 1
+                print(f"  ✓ Fixed {mdx_file}")
+
+    # Print summary
+    print(f"\n=== SUMMARY ===")
+    print(f"Files processed: {stats['files_processed']}")
+    print(f"Files modified: {stats['files_modified']}")
+    if mode in (LINKS_COMPREHENSIVE, ALL):
+        print_link_report(stats)
+    elif mode == LINKS:
+        print(f"Total links fixed: {stats['fixed_links']}")
+
+    return stats
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description='Fix kb://article/ links and .mdx link extensions in MDX files')
+    parser.add_argument('--mode', choices=MODES, default=ALL, help='Which fixes to apply (default: all)')
+    parser.add_argument('--articles', default=ARTICLES_JSONL, help='Path to articles.jsonl')
+    parser.add_argument('--docs-dir', default=DOCS_DIR, help='Docs root to scan for .mdx files')
+    args = parser.parse_args()
+
+    main(mode=args.mode, articles_jsonl=args.articles, docs_dir=args.docs_dir)
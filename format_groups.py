@@ -1,9 +1,18 @@
 import json
-from typing import Any, Dict, List, Union
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Union
+
+try:
+	import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+	_json_fast = None
 
 
 Page = Union[str, Dict[str, Any]]
 
+# docs.json is read and written in one go through a 1 MiB buffer
+IO_BUFFER_SIZE = 1 << 20
+
 
 # Explicit display name overrides for subgroups
 SUBGROUP_DISPLAY_NAME = {
@@ -27,6 +36,7 @@ SUBGROUP_DISPLAY_NAME = {
 }
 
 
+@lru_cache(maxsize=None)
 def default_title_case(slug: str) -> str:
 	# Replace dashes with spaces and title-case words
 	words = slug.replace("_", "-").split("-")
@@ -34,16 +44,17 @@ def default_title_case(slug: str) -> str:
 
 
 def display_name_for_subgroup(slug: str) -> str:
-	return SUBGROUP_DISPLAY_NAME.get(slug, default_title_case(slug))
+	return SUBGROUP_DISPLAY_NAME.get(slug) or default_title_case(slug)
 
 
 def reorder_groups(groups: List[Dict[str, Any]], desired_order: List[str]) -> List[Dict[str, Any]]:
-	index = {name: i for i, name in enumerate(desired_order)}
-	# Stable sort by desired index, unknowns go to end preserving existing order
-	def sort_key(g: Dict[str, Any]):
-		name = g.get("group", "")
-		return (index.get(name, 10_000),)
-	return sorted(groups, key=sort_key)
+	# Single pass into per-name buckets; unknowns go to end preserving existing order
+	buckets: Dict[str, List[Dict[str, Any]]] = {name: [] for name in desired_order}
+	unknown: List[Dict[str, Any]] = []
+	for g in groups:
+		bucket = buckets.get(g.get("group", ""))
+		(unknown if bucket is None else bucket).append(g)
+	return [g for name in buckets for g in buckets[name]] + unknown
 
 
 def infer_slug_from_item(item: Page) -> str:
@@ -52,31 +63,54 @@ def infer_slug_from_item(item: Page) -> str:
 		if isinstance(subpages, list) and subpages:
 			first = subpages[0]
 			if isinstance(first, str):
-				parts = first.split("/")
-				if len(parts) >= 3:
-					# parts[0]=product, parts[1]=topGroup, parts[2]=subgroup slug
-					return parts[2].lower()
+				# product/topGroup/subgroup[/...]: slice out the third segment without splitting
+				first_sep = first.find("/")
+				if first_sep != -1:
+					second_sep = first.find("/", first_sep + 1)
+					if second_sep != -1:
+						third_sep = first.find("/", second_sep + 1)
+						if third_sep == -1:
+							return first[second_sep + 1:].lower()
+						return first[second_sep + 1:third_sep].lower()
 		# Fallback: normalize current name into slug-ish
 		name = str(item.get("group", "")).strip().lower().replace(" ", "-")
 		return name
 	return ""
 
 
-def reorder_subgroups(pages: List[Page], desired_order_by_slug: List[str]) -> List[Page]:
-	index = {slug: i for i, slug in enumerate(desired_order_by_slug)}
-	# Stable sort, using inferred slug from first page path
-	def sort_key(item: Page):
+def reorder_subgroups(
+	pages: List[Page],
+	desired_order_by_slug: List[str],
+	slug_of: Callable[[Page], str] = infer_slug_from_item,
+) -> List[Page]:
+	# Single pass into per-slug buckets (slug inferred from first page path).
+	# Output: desired slugs in order, then plain page strings, then unknown subgroups.
+	buckets: Dict[str, List[Page]] = {slug: [] for slug in desired_order_by_slug}
+	plain: List[Page] = []
+	unknown: List[Page] = []
+	for item in pages:
 		if isinstance(item, dict):
-			slug = infer_slug_from_item(item)
-			return (index.get(slug, 10_000),)
-		return (9_999,)
-	return sorted(pages, key=sort_key)
+			bucket = buckets.get(slug_of(item))
+			(unknown if bucket is None else bucket).append(item)
+		else:
+			plain.append(item)
+	return [item for slug in buckets for item in buckets[slug]] + plain + unknown
 
 
 def transform(doc: Dict[str, Any]) -> Dict[str, Any]:
 	if "navigation" not in doc or "tabs" not in doc["navigation"]:
 		return doc
 
+	# Subgroups are visited for ordering and again for renaming; infer each slug once
+	slug_cache: Dict[int, str] = {}
+
+	def slug_of(item: Page) -> str:
+		key = id(item)
+		slug = slug_cache.get(key)
+		if slug is None:
+			slug = slug_cache[key] = infer_slug_from_item(item)
+		return slug
+
 	for tab in doc["navigation"]["tabs"]:
 		# First, apply top-level group ordering per tab
 		if tab.get("tab") == "redIQ":
@@ -121,14 +155,14 @@ def transform(doc: Dict[str, Any]) -> Dict[str, Any]:
 					"radix-research",
 					"settings-and-admin",
 				]
-				pages = reorder_subgroups(pages, desired_subgroup_slugs)
+				pages = reorder_subgroups(pages, desired_subgroup_slugs, slug_of)
 			elif tab.get("tab") == "redIQ" and group_name == "valuationIQ":
 				desired_subgroup_slugs = [
 					"about",
 					"how-to-use-the-model",
 					"troubleshooting",
 				]
-				pages = reorder_subgroups(pages, desired_subgroup_slugs)
+				pages = reorder_subgroups(pages, desired_subgroup_slugs, slug_of)
 			elif tab.get("tab") == "redIQ" and group_name == "QuickSync":
 				desired_subgroup_slugs = [
 					"getting-started",
@@ -136,13 +170,13 @@ def transform(doc: Dict[str, Any]) -> Dict[str, Any]:
 					"best-practices-and-tips",
 					"video-tutorials",
 				]
-				pages = reorder_subgroups(pages, desired_subgroup_slugs)
+				pages = reorder_subgroups(pages, desired_subgroup_slugs, slug_of)
 
 			# Rename subgroup display names based on inferred slug (from first page path)
 			new_pages: List[Page] = []
 			for item in pages:
 				if isinstance(item, dict) and "group" in item:
-					slug = infer_slug_from_item(item)
+					slug = slug_of(item)
 					item["group"] = display_name_for_subgroup(slug)
 					# Recurse into deeper levels
 					subpages = item.get("pages")
@@ -162,13 +196,16 @@ def transform(doc: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def main():
-	with open("docs.json", "r", encoding="utf-8") as f:
-		doc = json.load(f)
+	with open("docs.json", "rb", buffering=IO_BUFFER_SIZE) as f:
+		raw = f.read()
+	doc = _json_fast.loads(raw) if _json_fast is not None else json.loads(raw)
 
 	doc = transform(doc)
 
-	with open("docs.json", "w", encoding="utf-8") as f:
-		json.dump(doc, f, indent=4, ensure_ascii=False)
+	# orjson can only indent by 2, so output stays on stdlib json to keep docs.json's 4-space layout.
+	# Serialize to one string and write it once instead of json.dump's per-token writes.
+	with open("docs.json", "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+		f.write(json.dumps(doc, indent=4, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,23 @@
+"""Frontmatter reading shared by the sidebar title scripts"""
+from typing import Optional, Tuple
+
+
+def read_frontmatter(path) -> Tuple[Optional[str], Optional[int]]:
+    """Return (frontmatter, body_offset) for an MDX file, or (None, None)
+
+    Reads line by line up to the closing '---' and no further, so the body is
+    never loaded; body_offset is where it starts, for a later seek. There is no
+    limit on the number of frontmatter lines. Same block as
+    re.match(r"^---\\r?\\n([\\s\\S]*?)\\r?\\n---\\r?\\n", text): a '---' directly
+    after the opening one does not close it, and a file without a closing
+    '---' has no frontmatter.
+    """
+    with open(path, "r", encoding="utf-8", buffering=65536) as f:
+        if f.readline() != "---\n":
+            return None, None
+        lines = []
+        for line in iter(f.readline, ""):
+            if line == "---\n" and lines:
+                return "".join(lines)[:-1], f.tell()
+            lines.append(line)
+    return None, None
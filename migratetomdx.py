@@ -6,33 +6,336 @@ Converts S3-based knowledge base to Mintlify GitHub repository format
 
 import json
 import os
+import pickle
 import re
 import yaml
 import argparse
+from collections import defaultdict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
 from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Optional, Tuple, Union
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError
-import builtins
+import sys
+import threading
+from queue import Full, Queue
+
+try:
+    import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+    _json_fast = None
+
+# The libyaml-backed loader is roughly 10x faster than the pure-Python one.
+# PyYAML wheels bundle libyaml; source builds need the libyaml-dev headers.
+# Frontmatter is not emitted by libyaml, which escapes emoji as \U0001F600
+# and folds quoted scalars differently; see _dump_frontmatter.
+try:
+    from yaml import CSafeLoader as YamlLoader
+except ImportError:  # PyYAML built without libyaml
+    from yaml import SafeLoader as YamlLoader
+
+# S3 requests are latency-bound, so they are issued from a thread pool sharing
+# one client; the connection pool is sized to keep every worker busy, and TCP
+# keep-alive stops idle pooled connections from being dropped between batches
+MAX_WORKERS = 32
+S3_CONFIG = Config(
+    max_pool_connections=64,
+    retries={'max_attempts': 10, 'mode': 'adaptive'},
+    tcp_keepalive=True,
+)
+
+# Article conversion is CPU-bound regex/YAML work, so large batches are spread
+# over worker processes; below this many articles process startup costs more
+# than it saves
+TRANSFORM_POOL_MIN_ARTICLES = 200
+TRANSFORM_CHUNKSIZE = 16
+
+# Same trade-off for parsing the frontmatter of MDX files validate_migration
+# did not write itself
+VALIDATE_POOL_MIN_FILES = 200
+VALIDATE_CHUNKSIZE = 32
+# Characters read at a time while looking for the end of a frontmatter block
+FRONTMATTER_READ_SIZE = 4096
+
+# Threads writing converted MDX files; enough to hide filesystem latency on
+# network mounts without contending on local disks
+WRITE_WORKERS = 8
+
+# Windows and macOS file systems ignore case by default, so media ids that
+# differ only in case end up in the same local file there
+CASE_INSENSITIVE_FS = sys.platform in ('win32', 'darwin')
+
+# Frontmatter icon for articles in these categories
+_CATEGORY_ICONS = {
+    'reports': 'chart-line',
+    'settings': 'gear',
+    'tutorials': 'graduation-cap',
+    'troubleshooting': 'wrench',
+    'api': 'code',
+    'getting-started': 'rocket',
+    'general': 'book'
+}
+
+# Keys per list_objects_v2 request (1000 is the S3 maximum)
+LIST_PAGE_SIZE = 1000
+
+# Bytes read per chunk while streaming the JSONL manifest
+MANIFEST_CHUNK_SIZE = 64 * 1024
+
+# Media larger than 8 MiB is fetched as parallel ranged GETs instead of one stream
+MB = 1024 * 1024
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * MB,
+    multipart_chunksize=8 * MB,
+    max_concurrency=16,
+    use_threads=True,
+)
+
+# Patterns used while loading and converting every article, compiled once
+_MANIFEST_NUMERIC_ID_RE = re.compile(r':(\d+)$')
+_H1_RE = re.compile(r'^#\s+(.+)$', re.MULTILINE)
+_MD_ID_SUFFIX_RE = re.compile(r'\[(\d+)\]\.md$')
+_MD_SLUG_RE = re.compile(r'(.+?) \[\d+\]\.md$')
+_MEDIA_METADATA_KEY_RE = re.compile(r'(.+)/([^/]+)/metadata\.json$')
+_UID_UNSAFE_RE = re.compile(r'[^a-zA-Z0-9_-]')
+_MEDIA_REF_RE = re.compile(r'kb://media/([^)]+)')
+_MEDIA_REF_ID_RE = re.compile(r'kb://media/([^\s)]+)')
+_DIRECT_MEDIA_RE = re.compile(r'\((?:https?://[^)]+/)?kb/media/([^ )]+)\)')
+_STANDALONE_IMG_RE = re.compile(r'^!\[([^\]]*)\]\(([^)]+)\)$', re.MULTILINE)
+_ARTICLE_TAG_RE = re.compile(r"\{\{article:([^}]+)\}\}")
+_BRACKET_ID_RE = re.compile(r"\[(\d+)\]")
+_KB_ARTICLE_LINK_RE = re.compile(r"\[([^\]]+)\]\((?:https?://[^)]*/)?kb/articles/[^)]+\)")
+_KB_ARTICLE_SLUG_RE = re.compile(r"kb/articles/(.+?) \[\d+\]\.md$")
+_ZENDESK_LINK_RE = re.compile(r"\[([^\]]+)\]\([^)]*/articles/(\d+)[^)]*\)")
+_ADMONITION_RE = re.compile(r'^> \*\*(Note|Warning|Tip):\*\* (.+)$', re.MULTILINE)
+_STEP_BLOCK_RE = re.compile(r'((?:^\d+\. .+$\n?)+)', re.MULTILINE)
+_DESC_STRIP_RE = re.compile(r'[#*_`\[\]<!->]')
+_FILENAME_STRIP_RE = re.compile(r'[^\w\s-]')
+_FILENAME_HYPHEN_RE = re.compile(r'[-\s]+')
+_PATH_UNSAFE_RE = re.compile(r'[^\w-]')
+_MULTI_HYPHEN_RE = re.compile(r'-+')
+# Single-line strings PyYAML writes without escapes (allow_unicode=True): plain
+# or single-quoted, never double-quoted
+_YAML_PRINTABLE_RE = re.compile(
+    "[\x20-\x7e\u00a0-\u2027\u202a-\ud7ff\ue000-\ufefe\uff00-\ufffd\U00010000-\U0010fffe]*\\Z"
+)
+# Anything that keeps such a string from being a plain block scalar: leading
+# or trailing spaces and YAML indicators (the resolver is checked separately)
+_YAML_NOT_PLAIN_RE = re.compile(
+    r"""\A[ #,\[\]{}&*!|>'"%@`]|\A[?:-](?: |\Z)|\A(?:---|\.\.\.)|: |:\Z| #| \Z"""
+)
+_SPACE_RUN_RE = re.compile(r'( +)')
+_QUOTED_TOKEN_RE = re.compile(r"( +|')")
+_YAML_RESOLVER = yaml.resolver.Resolver()
+_YAML_STR_TAG = 'tag:yaml.org,2002:str'
+
+def _loads_json(data: bytes):
+    """json.loads, parsed by orjson when it is installed
+
+    Input orjson rejects (invalid UTF-8, a BOM, NaN) goes through json.loads,
+    so results and errors match the stdlib. The one difference: orjson reads
+    integers beyond 64 bits as floats.
+    """
+    if _json_fast is not None:
+        try:
+            return _json_fast.loads(data)
+        except _json_fast.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+
+# Titles and category/section names repeat across articles and manifest links,
+# so their URL-safe forms are computed once per distinct string
+@lru_cache(maxsize=None)
+def _filename_from_title(title: str) -> str:
+    # Remove special characters and convert to lowercase
+    filename = _FILENAME_STRIP_RE.sub('', title.lower())
+    # Replace spaces with hyphens
+    filename = _FILENAME_HYPHEN_RE.sub('-', filename)
+    # Remove leading/trailing hyphens
+    return filename.strip('-')[:50]  # Limit length
+
+
+@lru_cache(maxsize=None)
+def _sanitized_path(path: str) -> str:
+    if not path:
+        return 'general'
+    
+    # Convert to lowercase and replace special chars
+    sanitized = _PATH_UNSAFE_RE.sub('-', path.lower())
+    # Remove multiple hyphens
+    sanitized = _MULTI_HYPHEN_RE.sub('-', sanitized)
+    return sanitized.strip('-')
+
+
+def _dump_frontmatter(frontmatter: Dict) -> str:
+    """yaml.dump(frontmatter, default_flow_style=False, allow_unicode=True)
+
+    Frontmatter is a flat mapping of single-line strings, which PyYAML writes
+    as `key: value` lines, plain or single-quoted, folded at a single space
+    once past column 80. Those lines are built directly, following the
+    emitter's rules; any other value sends the mapping through yaml.dump.
+    """
+    lines = []
+    for key in sorted(frontmatter):
+        value = frontmatter[key]
+        if type(value) is not str or not _YAML_PRINTABLE_RE.match(value):
+            return yaml.dump(frontmatter, default_flow_style=False, allow_unicode=True)
+        if (value and not _YAML_NOT_PLAIN_RE.search(value)
+                and _YAML_RESOLVER.resolve(yaml.ScalarNode, value, (True, False)) == _YAML_STR_TAG):
+            column = len(key) + 2
+            line = [key, ': ']
+            for i, token in enumerate(_SPACE_RUN_RE.split(value)):
+                if i % 2 and token == ' ' and column > 80:
+                    line.append('\n  ')
+                    column = 2
+                else:
+                    line.append(token)
+                    column += len(token)
+            line.append('\n')
+        else:
+            # Single-quoted: quotes are doubled, and leading or trailing
+            # spaces are never turned into a line break
+            column = len(key) + 3
+            line = [key, ": '"]
+            position = 0
+            last = len(value) - 1
+            for token in _QUOTED_TOKEN_RE.split(value):
+                if token == "'":
+                    line.append("''")
+                    column += 2
+                elif token == ' ' and column > 80 and 0 < position < last:
+                    line.append('\n  ')
+                    column = 2
+                else:
+                    line.append(token)
+                    column += len(token)
+                position += len(token)
+            line.append("'\n")
+        lines.append(''.join(line))
+    return ''.join(lines)
+
+
+@dataclass(slots=True)
+class Article:
+    """An article loaded from S3 and, once converted, where its MDX was written"""
+    metadata: Dict
+    content: str
+    article_id: str
+    uid: str
+    file_path: Optional[str] = None
+
+
+@dataclass(slots=True)
+class MediaEntry:
+    """Metadata of a media object and the S3 prefix it lives under"""
+    metadata: Dict
+    s3_prefix: str
+    media_id: str
+
+
+def _prefetch(iterable, depth: int = 2):
+    """Iterate over iterable on a background thread, keeping up to depth items ready
+
+    Used for S3 pagination so the next page is already being requested while
+    the caller handles the current one.
+    """
+    queue = Queue(maxsize=depth)
+    stop = threading.Event()
+    done = object()
+
+    def put(entry) -> bool:
+        # Give up once the consumer has gone away instead of blocking forever
+        while not stop.is_set():
+            try:
+                queue.put(entry, timeout=0.1)
+                return True
+            except Full:
+                pass
+        return False
 
-# Ensure printing doesn't fail on Windows consoles without UTF-8
-def _print_unicode_safe(*args, **kwargs):
-    ascii_args = []
-    for a in args:
+    def produce():
         try:
-            ascii_args.append(str(a).encode('ascii', 'ignore').decode('ascii'))
+            for item in iterable:
+                if not put((item, None)):
+                    return
+        except Exception as e:
+            put((done, e))
+            return
+        put((done, None))
+
+    threading.Thread(target=produce, daemon=True).start()
+    try:
+        while True:
+            item, error = queue.get()
+            if item is done:
+                if error is not None:
+                    raise error
+                return
+            yield item
+    finally:
+        stop.set()
+
+
+# Per-process migrator used by _transform_worker, set up by _init_transform_worker
+_worker_migrator = None
+
+
+def _init_transform_worker(migrator_cls, path_by_numeric_id: Dict, path_by_slug: Dict):
+    """Build the state article conversion needs, without an S3 client"""
+    global _worker_migrator
+    migrator = migrator_cls.__new__(migrator_cls)
+    migrator.path_by_numeric_id = path_by_numeric_id
+    migrator.path_by_slug = path_by_slug
+    _worker_migrator = migrator
+
+
+def _transform_worker(task: Tuple[str, Dict, str]):
+    result, error = _worker_migrator._transform_task(task)
+    if error is not None:
+        # The error travels back to the parent; keep its message if it cannot be pickled
+        try:
+            pickle.dumps(error)
         except Exception:
-            ascii_args.append(str(a))
-    builtins.print(*ascii_args, **kwargs)
+            error = RuntimeError(str(error))
+    return result, error
+
+
+def _read_frontmatter(mdx_file: str):
+    """(status, value) for one MDX file: ('ok', frontmatter), ('missing', None),
+    ('unterminated', None) or ('error', message)"""
+    try:
+        # Only the frontmatter is checked, so stop reading once its closing
+        # fence has been seen
+        with open(mdx_file, 'r', encoding='utf-8') as f:
+            content = f.read(FRONTMATTER_READ_SIZE)
+            if not content.startswith('---'):
+                return 'missing', None
+            fence_end = content.find('---', 3)
+            while fence_end == -1:
+                chunk = f.read(FRONTMATTER_READ_SIZE)
+                if not chunk:
+                    return 'unterminated', None
+                # A fence may straddle the chunk boundary
+                start = max(3, len(content) - 2)
+                content += chunk
+                fence_end = content.find('---', start)
+        return 'ok', yaml.load(content[3:fence_end], Loader=YamlLoader)
+    except Exception as e:
+        return 'error', str(e)
 
-# Override print for this script
-print = _print_unicode_safe
 
 class MintlifyMigrator:
     """Migrates S3-based documentation to Mintlify format"""
     
-    def __init__(self, bucket: str, prefix: str, output_dir: str, aws_profile: Optional[str] = None):
+    def __init__(self, bucket: str, prefix: str, output_dir: str, aws_profile: Optional[str] = None,
+                 cache_dir: Optional[str] = None):
         """
         Initialize the migrator
         
@@ -41,12 +344,14 @@ class MintlifyMigrator:
             prefix: S3 prefix (e.g., 'kb/')
             output_dir: Local output directory for Mintlify docs
             aws_profile: Optional AWS profile name
+            cache_dir: Optional directory keeping downloaded manifest, article
+                and media metadata bodies between runs, keyed by ETag
         """
         if aws_profile:
             session = boto3.Session(profile_name=aws_profile)
-            self.s3_client = session.client('s3')
+            self.s3_client = session.client('s3', config=S3_CONFIG)
         else:
-            self.s3_client = boto3.client('s3')
+            self.s3_client = boto3.client('s3', config=S3_CONFIG)
             
         self.bucket = bucket
         self.prefix = prefix
@@ -58,8 +363,10 @@ class MintlifyMigrator:
         (self.output_dir / 'snippets').mkdir(exist_ok=True)
         
         # Track processed items
-        self.articles = {}
-        self.media_map = {}
+        self.articles: Dict[str, Article] = {}
+        self.media_map: Dict[str, MediaEntry] = {}
+        # Referenced media id -> first article referencing it, built by load_articles
+        self.article_by_media: Dict[str, Article] = {}
         self.navigation_structure = {'radix': {}, 'rediq': {}}
         self.migration_stats = {
             'articles_processed': 0,
@@ -71,6 +378,24 @@ class MintlifyMigrator:
         self.manifest_by_article_id: Dict[str, Dict] = {}
         self.manifest_by_numeric_id: Dict[str, Dict] = {}
         self.manifest_by_slug: Dict[str, Dict] = {}
+        # Output path (or None) of the manifest item behind each numeric id
+        # and slug, built from the indexes above by _index_manifest_paths
+        self.path_by_numeric_id: Dict[str, Optional[str]] = {}
+        self.path_by_slug: Dict[str, Optional[str]] = {}
+        # Every key under media/, listed once by load_media_metadata
+        self._media_listing: Optional[List[str]] = None
+        # Frontmatter of every MDX file written by convert_articles, keyed by
+        # normalized output path, so validation need not read them back
+        self._written_frontmatter: Dict[str, Dict] = {}
+        # Output directories already created during this run
+        self._created_dirs = set()
+        # ETag of every key seen while listing, for the object cache
+        self._listed_etags: Dict[str, str] = {}
+        # key -> (ETag, body): bodies cached by the previous run, and those
+        # fetched or reused by this one (the only ones saved again)
+        self._s3_cache_path = os.path.join(cache_dir, f"s3-{bucket}.pkl") if cache_dir else None
+        self._s3_cache_previous: Dict[str, Tuple[str, bytes]] = self._load_s3_cache()
+        self._s3_cache: Optional[Dict[str, Tuple[str, bytes]]] = {} if self._s3_cache_path else None
 
     def run_migration(self):
         """Execute the complete migration process"""
@@ -86,6 +411,7 @@ class MintlifyMigrator:
         # Step 2: Load media metadata
         print("\n🖼️  Loading media metadata...")
         self.load_media_metadata()
+        self._save_s3_cache()
         
         # Step 3: Process and convert articles
         print("\n✨ Converting articles to MDX...")
@@ -118,91 +444,416 @@ class MintlifyMigrator:
         """
         try:
             manifest_key = f"{self.prefix}manifests/articles.jsonl"
-            obj = self.s3_client.get_object(Bucket=self.bucket, Key=manifest_key)
-            body = obj['Body'].read().decode('utf-8', errors='ignore')
-            for line in body.splitlines():
+            if self._s3_cache is None:
+                obj = self.s3_client.get_object(Bucket=self.bucket, Key=manifest_key)
+                # Lines are streamed and parsed as bytes, so the whole file is
+                # never held in memory or decoded up front
+                lines = obj['Body'].iter_lines(chunk_size=MANIFEST_CHUNK_SIZE)
+            else:
+                # Cached bodies are whole; splitlines splits as iter_lines does
+                lines = self._get_object_bytes(manifest_key).splitlines()
+            # Bound once for the loop below, which runs per manifest line
+            by_article_id = self.manifest_by_article_id
+            by_numeric_id = self.manifest_by_numeric_id
+            by_slug = self.manifest_by_slug
+            numeric_id_search = _MANIFEST_NUMERIC_ID_RE.search
+            for line in lines:
                 line = line.strip()
                 if not line:
                     continue
                 try:
-                    item = json.loads(line)
+                    item = _loads_json(line)
+                except UnicodeDecodeError:
+                    # Stray invalid bytes are dropped, as with errors='ignore'
+                    try:
+                        item = json.loads(line.decode('utf-8', errors='ignore'))
+                    except Exception:
+                        continue
                 except Exception:
                     continue
 
                 article_id = str(item.get('article_id', ''))
-                slug = str(item.get('slug', '')) if item.get('slug') is not None else ''
-                self.manifest_by_article_id[article_id] = item
+                slug = item.get('slug')
+                slug = str(slug) if slug is not None else ''
+                by_article_id[article_id] = item
 
                 # Extract numeric id (e.g., '...:38790618700820')
-                m = re.search(r':(\d+)$', article_id)
+                m = numeric_id_search(article_id)
                 if m:
-                    self.manifest_by_numeric_id[m.group(1)] = item
+                    by_numeric_id[m.group(1)] = item
 
                 if slug:
-                    self.manifest_by_slug[slug] = item
+                    by_slug[slug] = item
 
         except ClientError:
             # Manifest is optional; continue silently
             pass
 
-    def load_articles(self):
-        """Load all articles from S3
+        self._index_manifest_paths()
 
-        Uses the full relative path under `articles/` as a unique identifier to
-        avoid collisions when different folders share the same leaf folder name.
+    def _index_manifest_paths(self):
+        """Compute the output path of every manifest item once
+
+        Article links are resolved through these maps, so a target linked
+        from many articles is not sanitized again for every link.
+        """
+        def path_of(item: Dict) -> Optional[str]:
+            return self._compute_path_from_manifest_item(item) if item else None
+
+        self.path_by_numeric_id = {numeric_id: path_of(item) for numeric_id, item in self.manifest_by_numeric_id.items()}
+        self.path_by_slug = {slug: path_of(item) for slug, item in self.manifest_by_slug.items()}
+
+    def _load_s3_cache(self) -> Dict[str, Tuple[str, bytes]]:
+        """Object bodies saved by the previous run, or {} without a usable cache"""
+        if not self._s3_cache_path:
+            return {}
+        try:
+            with open(self._s3_cache_path, 'rb') as f:
+                return pickle.load(f)
+        except Exception:
+            return {}
+
+    def _save_s3_cache(self):
+        """Persist the bodies used by this run, replacing the previous cache atomically"""
+        if self._s3_cache is None:
+            return
+        os.makedirs(os.path.dirname(self._s3_cache_path) or '.', exist_ok=True)
+        tmp_path = self._s3_cache_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self._s3_cache, f, protocol=5)
+        os.replace(tmp_path, self._s3_cache_path)
+
+    @staticmethod
+    def _write_bytes_atomic(path: Path, data: bytes):
+        """Write data to a temporary sibling and rename it over path
+
+        Readers, and other runs writing the same output, only ever see a
+        complete file.
+        """
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        try:
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+
+    def _get_object_bytes(self, key: str) -> bytes:
+        """Body of an S3 object; safe to call from worker threads
+
+        With a cache directory, a body whose ETag matches the listing (or, for
+        keys that were not listed, a conditional GET answering 304) is served
+        from the previous run's cache instead of being downloaded again.
+        """
+        if self._s3_cache is None:
+            return self.s3_client.get_object(Bucket=self.bucket, Key=key)['Body'].read()
+
+        cached = self._s3_cache_previous.get(key)
+        listed_etag = self._listed_etags.get(key)
+        if cached is not None and listed_etag is not None:
+            if cached[0] == listed_etag:
+                self._s3_cache[key] = cached
+                return cached[1]
+            cached = None
+        try:
+            if cached is not None:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=key, IfNoneMatch=cached[0])
+            else:
+                response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
+        except ClientError as e:
+            if cached is not None and e.response.get('Error', {}).get('Code') in ('304', 'NotModified'):
+                self._s3_cache[key] = cached
+                return cached[1]
+            raise
+        body = response['Body'].read()
+        etag = response.get('ETag')
+        if etag:
+            self._s3_cache[key] = (etag, body)
+        return body
+
+    def _ensure_dir(self, directory: str):
+        """os.makedirs, skipping directories already created during this run"""
+        if directory not in self._created_dirs:
+            os.makedirs(directory, exist_ok=True)
+            self._created_dirs.add(directory)
+
+    def _s3_executor(self) -> Executor:
+        """Executor used for every batch of S3 requests
+
+        Override to plug in a different backend. Workers are bound methods
+        that share self.s3_client, so a process-based executor also needs
+        workers that create their own client (and event loop, for an async
+        S3 library) inside each process.
+        """
+        return ThreadPoolExecutor(max_workers=MAX_WORKERS)
+
+    def _list_objects(self, prefix: str):
+        """Yield every object summary under prefix, following pagination
+
+        The next page is fetched in the background while the current one is
+        consumed, so consecutive LIST round trips overlap with the caller's work.
         """
         paginator = self.s3_client.get_paginator('list_objects_v2')
         pages = paginator.paginate(
             Bucket=self.bucket,
-            Prefix=f"{self.prefix}articles/"
+            Prefix=prefix,
+            PaginationConfig={'PageSize': LIST_PAGE_SIZE}
         )
-
+        etags = self._listed_etags
+        for page in _prefetch(pages):
+            contents = page.get('Contents', [])
+            for obj in contents:
+                etag = obj.get('ETag')
+                if etag:
+                    etags[obj['Key']] = etag
+            yield from contents
+
+    def _list_objects_by_folder(self, prefix: str):
+        """Like _list_objects, but lists each top-level folder under prefix concurrently
+
+        Keys are yielded in the same (lexicographic) order as _list_objects.
+        The first folder is streamed while the others are listed on a thread
+        pool. Only worth it for prefixes with a handful of large folders, such
+        as articles/ split by product.
+        """
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        pages = paginator.paginate(
+            Bucket=self.bucket,
+            Prefix=prefix,
+            Delimiter='/',
+            PaginationConfig={'PageSize': LIST_PAGE_SIZE}
+        )
+        # (sort key, object summary or None for a folder); a folder's keys all
+        # sort next to each other, at the position of the folder prefix
+        entries = []
+        etags = self._listed_etags
         for page in pages:
-            if 'Contents' not in page:
-                continue
+            for obj in page.get('Contents', []):
+                etag = obj.get('ETag')
+                if etag:
+                    etags[obj['Key']] = etag
+                entries.append((obj['Key'], obj))
+            entries.extend((p['Prefix'], None) for p in page.get('CommonPrefixes', []))
+        entries.sort(key=lambda entry: entry[0])
+
+        folders = [name for name, obj in entries if obj is None]
+        if not folders:
+            yield from (obj for _, obj in entries)
+            return
+        with ThreadPoolExecutor(max_workers=min(len(folders), MAX_WORKERS)) as executor:
+            # The first folder is streamed below rather than listed up front
+            listed = {folder: executor.submit(lambda f: list(self._list_objects(f)), folder)
+                      for folder in folders[1:]}
+            for name, obj in entries:
+                if obj is not None:
+                    yield obj
+                elif name in listed:
+                    yield from listed[name].result()
+                else:
+                    yield from self._list_objects(name)
+
+    def _article_uid(self, key: str) -> str:
+        """Relative path of an article folder inside articles/ (its unique id)"""
+        relative = key.split(f"{self.prefix}articles/")[-1]
+        return relative.rsplit('/', 1)[0]
+
+    @staticmethod
+    def _article_key_kind(key: str) -> Optional[str]:
+        """Classify an articles/ key as 'metadata', 'content', 'legacy' or None"""
+        if key.endswith('metadata.json'):
+            return 'metadata'
+        if key.endswith('content.md'):
+            return 'content'
+        # Support flat .md articles (legacy export):
+        if key.endswith('.md') and '/articles/' in key and '/article-' not in key:
+            return 'legacy'
+        return None
+
+    def _fetch_article(self, task: Tuple[str, str]) -> List[Tuple[str, str, Union[Article, Dict, None], Optional[Exception]]]:
+        """Download one article key; runs on a worker thread and never touches shared state
+
+        A 'paired' task is a metadata.json whose content.md was listed right
+        before it. Its content is only downloaded once, with the metadata. The
+        content-only article is fetched as well when the metadata fails or its
+        content.md could not be downloaded, so any error the content.md key
+        would have recorded on its own is still recorded. When the metadata
+        loads, the content-only article (which the metadata article replaced)
+        is not loaded, so its "Loaded (content-only)" line is not printed.
+        """
+        kind, key = task
+        content_key = key.replace('metadata.json', 'content.md')
+        try:
+            if kind in ('metadata', 'paired'):
+                result = self._fetch_metadata_article(key)
+            elif kind == 'content':
+                result = self._fetch_content_only_article(key)
+            else:
+                result = self._fetch_legacy_article(key)
+        except Exception as e:
+            if kind == 'paired':
+                return self._fetch_article(('content', content_key)) + [('metadata', key, None, e)]
+            return [(kind, key, None, e)]
+        if kind == 'paired':
+            if result['missing_content']:
+                return self._fetch_article(('content', content_key)) + [('metadata', key, result, None)]
+            kind = 'metadata'
+        return [(kind, key, result, None)]
+
+    def _fetch_metadata_article(self, key: str) -> Dict:
+        # Download metadata
+        metadata = _loads_json(self._get_object_bytes(key))
+
+        # Download content
+        content_key = key.replace('metadata.json', 'content.md')
+        try:
+            content = self._get_object_bytes(content_key).decode('utf-8')
+            missing_content = False
+        except ClientError:
+            content = ""
+            missing_content = True
 
-            for obj in page['Contents']:
-                key = obj['Key']
+        return {'metadata': metadata, 'content': content, 'missing_content': missing_content}
 
-                # Process metadata.json files
-                if key.endswith('metadata.json'):
+    def _fetch_content_only_article(self, key: str) -> Article:
+        uid = self._article_uid(key)
+
+        # Download content
+        content = self._get_object_bytes(key).decode('utf-8')
+
+        # Infer a title from the first H1 or fallback to folder name
+        m = _H1_RE.search(content)
+        leaf_article_id = uid.split('/')[-1]
+        inferred_title = m.group(1).strip() if m else leaf_article_id.replace('-', ' ').title()
+
+        metadata = {
+            'title': inferred_title,
+            'description': None,
+            'product': 'general',
+            'category': 'uncategorized',
+        }
+
+        return Article(
+            metadata=metadata,
+            content=content,
+            article_id=leaf_article_id,
+            uid=uid,
+        )
+
+    def _fetch_legacy_article(self, key: str) -> Article:
+        # Example key: kb/articles/slug-name [123456].md
+        filename = key.split('/')[-1]
+        m_id = _MD_ID_SUFFIX_RE.search(filename)
+        m_slug = _MD_SLUG_RE.match(filename)
+        numeric_id = m_id.group(1) if m_id else None
+        slug = m_slug.group(1) if m_slug else filename[:-3]
+
+        # Download content
+        content = self._get_object_bytes(key).decode('utf-8', errors='ignore')
+
+        # Try to enrich from manifest
+        manifest_item = None
+        if numeric_id and numeric_id in self.manifest_by_numeric_id:
+            manifest_item = self.manifest_by_numeric_id[numeric_id]
+        elif slug and slug in self.manifest_by_slug:
+            manifest_item = self.manifest_by_slug[slug]
+
+        leaf_article_id = numeric_id or slug
+        if manifest_item:
+            metadata = {
+                'title': manifest_item.get('title') or slug.replace('-', ' ').title(),
+                'description': None,
+                'product': (manifest_item.get('product') or 'general').lower(),
+                'category': manifest_item.get('category') or 'uncategorized',
+                'section': manifest_item.get('section'),
+                'tags': manifest_item.get('tags') or [],
+                'media_ids': manifest_item.get('media_ids') or [],
+            }
+        else:
+            # Fallback: infer title from H1
+            m_h1 = _H1_RE.search(content)
+            inferred_title = m_h1.group(1).strip() if m_h1 else slug.replace('-', ' ').title()
+            metadata = {
+                'title': inferred_title,
+                'description': None,
+                'product': 'general',
+                'category': 'uncategorized',
+            }
+
+        uid = f"legacy/{leaf_article_id}"
+        return Article(
+            metadata=metadata,
+            content=content,
+            article_id=leaf_article_id,
+            uid=uid,
+        )
+
+    def load_articles(self):
+        """Load all articles from S3
+
+        Uses the full relative path under `articles/` as a unique identifier to
+        avoid collisions when different folders share the same leaf folder name.
+
+        Objects are downloaded on a thread pool as soon as their listing page
+        arrives; results are merged on the calling thread in listing order, so
+        the outcome matches a serial load.
+        """
+        def tasks():
+            # content.md sorts right before its metadata.json; hold it back
+            # so the pair can be fetched as one task
+            pending_content = None
+            for obj in self._list_objects_by_folder(f"{self.prefix}articles/"):
+                key = obj['Key']
+                kind = self._article_key_kind(key)
+                if not kind:
+                    continue
+                if pending_content is not None:
+                    if kind == 'metadata' and key.replace('metadata.json', 'content.md') == pending_content:
+                        pending_content = None
+                        yield 'paired', key
+                        continue
+                    yield 'content', pending_content
+                    pending_content = None
+                if kind == 'content':
+                    pending_content = key
+                else:
+                    yield kind, key
+            if pending_content is not None:
+                yield 'content', pending_content
+
+        with self._s3_executor() as executor:
+            fetched = executor.map(self._fetch_article, tasks())
+            for kind, key, result, error in chain.from_iterable(fetched):
+                if kind == 'metadata':
                     # Unique identifier is the relative path inside articles/
                     # Example: kb/articles/radix/reports/article-1/metadata.json ->
                     # uid = radix/reports/article-1
                     try:
-                        relative = key.split(f"{self.prefix}articles/")[-1]
-                        uid = relative.rsplit('/', 1)[0]
+                        uid = self._article_uid(key)
                     except Exception:
                         uid = key.split('/')[-2]
 
                     leaf_article_id = uid.split('/')[-1]
 
                     try:
-                        # Download metadata
-                        response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                        metadata = json.loads(response['Body'].read())
-
-                        # Download content
-                        content_key = key.replace('metadata.json', 'content.md')
-                        try:
-                            content_response = self.s3_client.get_object(
-                                Bucket=self.bucket,
-                                Key=content_key
-                            )
-                            content = content_response['Body'].read().decode('utf-8')
-                        except ClientError:
-                            content = ""
+                        if error is not None:
+                            raise error
+                        metadata = result['metadata']
+
+                        if result['missing_content']:
                             self.migration_stats['warnings'].append(
                                 f"No content.md found for {uid}"
                             )
 
                         # Store article data
-                        self.articles[uid] = {
-                            'metadata': metadata,
-                            'content': content,
-                            'article_id': leaf_article_id,
-                            'uid': uid,
-                        }
+                        self.articles[uid] = Article(
+                            metadata=metadata,
+                            content=result['content'],
+                            article_id=leaf_article_id,
+                            uid=uid,
+                        )
 
                         print(f"  ✓ Loaded: {metadata.get('title', leaf_article_id)}")
 
@@ -213,42 +864,16 @@ class MintlifyMigrator:
                         print(f"  ✗ Error loading {uid}: {str(e)}")
 
                 # Also support articles that only have content.md without metadata
-                elif key.endswith('content.md'):
-                    try:
-                        relative = key.split(f"{self.prefix}articles/")[-1]
-                        uid = relative.rsplit('/', 1)[0]
-
-                        # Skip if already loaded via metadata.json
-                        if uid in self.articles:
-                            continue
+                elif kind == 'content':
+                    # Skip if already loaded via metadata.json
+                    if self._article_uid(key) in self.articles:
+                        continue
 
-                        # Download content
-                        content_response = self.s3_client.get_object(
-                            Bucket=self.bucket,
-                            Key=key
-                        )
-                        content = content_response['Body'].read().decode('utf-8')
-
-                        # Infer a title from the first H1 or fallback to folder name
-                        m = re.search(r'^#\s+(.+)$', content, flags=re.MULTILINE)
-                        leaf_article_id = uid.split('/')[-1]
-                        inferred_title = m.group(1).strip() if m else leaf_article_id.replace('-', ' ').title()
-
-                        metadata = {
-                            'title': inferred_title,
-                            'description': None,
-                            'product': 'general',
-                            'category': 'uncategorized',
-                        }
-
-                        self.articles[uid] = {
-                            'metadata': metadata,
-                            'content': content,
-                            'article_id': leaf_article_id,
-                            'uid': uid,
-                        }
-
-                        print(f"  ✓ Loaded (content-only): {inferred_title}")
+                    try:
+                        if error is not None:
+                            raise error
+                        self.articles[result.uid] = result
+                        print(f"  ✓ Loaded (content-only): {result.metadata['title']}")
 
                     except Exception as e:
                         self.migration_stats['errors'].append(
@@ -256,61 +881,12 @@ class MintlifyMigrator:
                         )
                         print(f"  ✗ Error loading content-only at {key}: {str(e)}")
 
-                # Support flat .md articles (legacy export):
-                elif key.endswith('.md') and '/articles/' in key and '/article-' not in key:
+                else:
                     try:
-                        # Example key: kb/articles/slug-name [123456].md
-                        filename = key.split('/')[-1]
-                        m_id = re.search(r'\[(\d+)\]\.md$', filename)
-                        m_slug = re.match(r'(.+?) \[\d+\]\.md$', filename)
-                        numeric_id = m_id.group(1) if m_id else None
-                        slug = m_slug.group(1) if m_slug else filename[:-3]
-
-                        # Download content
-                        content_response = self.s3_client.get_object(
-                            Bucket=self.bucket,
-                            Key=key
-                        )
-                        content = content_response['Body'].read().decode('utf-8', errors='ignore')
-
-                        # Try to enrich from manifest
-                        manifest_item = None
-                        if numeric_id and numeric_id in self.manifest_by_numeric_id:
-                            manifest_item = self.manifest_by_numeric_id[numeric_id]
-                        elif slug and slug in self.manifest_by_slug:
-                            manifest_item = self.manifest_by_slug[slug]
-
-                        leaf_article_id = numeric_id or slug
-                        if manifest_item:
-                            metadata = {
-                                'title': manifest_item.get('title') or slug.replace('-', ' ').title(),
-                                'description': None,
-                                'product': (manifest_item.get('product') or 'general').lower(),
-                                'category': manifest_item.get('category') or 'uncategorized',
-                                'section': manifest_item.get('section'),
-                                'tags': manifest_item.get('tags') or [],
-                                'media_ids': manifest_item.get('media_ids') or [],
-                            }
-                        else:
-                            # Fallback: infer title from H1
-                            m_h1 = re.search(r'^#\s+(.+)$', content, flags=re.MULTILINE)
-                            inferred_title = m_h1.group(1).strip() if m_h1 else slug.replace('-', ' ').title()
-                            metadata = {
-                                'title': inferred_title,
-                                'description': None,
-                                'product': 'general',
-                                'category': 'uncategorized',
-                            }
-
-                        uid = f"legacy/{leaf_article_id}"
-                        self.articles[uid] = {
-                            'metadata': metadata,
-                            'content': content,
-                            'article_id': leaf_article_id,
-                            'uid': uid,
-                        }
-
-                        print(f"  ✓ Loaded (legacy .md): {metadata['title']}")
+                        if error is not None:
+                            raise error
+                        self.articles[result.uid] = result
+                        print(f"  ✓ Loaded (legacy .md): {result.metadata['title']}")
 
                     except Exception as e:
                         self.migration_stats['errors'].append(
@@ -318,43 +894,58 @@ class MintlifyMigrator:
                         )
                         print(f"  ✗ Error loading legacy .md at {key}: {str(e)}")
 
+        self.article_by_media = self._index_media_references()
+
+    def _fetch_media_metadata(self, key: str) -> Tuple[str, Optional[Dict], Optional[Exception]]:
+        """Download one media metadata.json; runs on a worker thread"""
+        try:
+            return key, _loads_json(self._get_object_bytes(key)), None
+        except Exception as e:
+            return key, None, e
+
     def load_media_metadata(self):
-        """Load media metadata from S3"""
-        paginator = self.s3_client.get_paginator('list_objects_v2')
-        pages = paginator.paginate(
-            Bucket=self.bucket,
-            Prefix=f"{self.prefix}media/"
-        )
-        
-        for page in pages:
-            if 'Contents' not in page:
-                continue
-                
-            for obj in page['Contents']:
+        """Load media metadata from S3
+
+        Only metadata for media referenced by a loaded article is fetched. The
+        full media/ listing is kept in self._media_listing so
+        download_media_files does not have to list the prefix again.
+        """
+        # Media folders may be named with or without the file extension
+        wanted = set()
+        for media_id in self.article_by_media:
+            name = media_id.split('/')[-1]
+            wanted.add(name)
+            wanted.add(os.path.splitext(name)[0])
+
+        self._media_listing = []
+
+        def keys():
+            for obj in self._list_objects(f"{self.prefix}media/"):
                 key = obj['Key']
-                
-                if key.endswith('metadata.json'):
-                    media_id = key.split('/')[-2]
-                    
-                    try:
-                        response = self.s3_client.get_object(Bucket=self.bucket, Key=key)
-                        metadata = json.loads(response['Body'].read())
-                        
-                        # Find actual media file
-                        media_pattern = re.match(r'(.+)/([^/]+)/metadata\.json$', key)
-                        if media_pattern:
-                            base_path = media_pattern.group(1)
-                            
-                            # Construct media file path
-                            # Try to find the actual file
-                            self.media_map[media_id] = {
-                                'metadata': metadata,
-                                's3_prefix': base_path,
-                                'media_id': media_id
-                            }
-                            
-                    except Exception as e:
-                        print(f"  Warning: Could not load media metadata for {media_id}: {e}")
+                self._media_listing.append(key)
+                if key.endswith('metadata.json') and key.split('/')[-2] in wanted:
+                    yield key
+
+        with self._s3_executor() as executor:
+            for key, metadata, error in executor.map(self._fetch_media_metadata, keys()):
+                media_id = key.split('/')[-2]
+
+                if error is not None:
+                    print(f"  Warning: Could not load media metadata for {media_id}: {error}")
+                    continue
+
+                # Find actual media file
+                media_pattern = _MEDIA_METADATA_KEY_RE.match(key)
+                if media_pattern:
+                    base_path = media_pattern.group(1)
+
+                    # Construct media file path
+                    # Try to find the actual file
+                    self.media_map[media_id] = MediaEntry(
+                        metadata=metadata,
+                        s3_prefix=base_path,
+                        media_id=media_id
+                    )
 
     def convert_articles(self):
         """Convert all articles to MDX format
@@ -362,35 +953,68 @@ class MintlifyMigrator:
         Ensures unique output filenames when multiple articles would otherwise
         map to the same product/category/section/title path.
         """
+        # Transform everything first so output directories can be created in
+        # one batch before the write loop
+        out = str(self.output_dir)
         used_paths = set()
-        for uid, article_data in self.articles.items():
+        converted = []
+        items = list(self.articles.items())
+        transformed = self._transform_all([(uid, a.metadata, a.content) for uid, a in items])
+        for (uid, article_data), (result, error) in zip(items, transformed):
             try:
-                file_path, mdx_content = self.transform_article_to_mdx(
-                    uid,
-                    article_data['metadata'],
-                    article_data['content']
-                )
+                if error is not None:
+                    raise error
+                file_path, mdx_content, mintlify_frontmatter = result
 
-                # Ensure uniqueness of file path
+                # Ensure uniqueness of file path; the uid suffix keeps it stable
+                # across runs, the counter only covers a suffixed path that
+                # happens to repeat one already used
                 if file_path in used_paths:
-                    base, ext = os.path.splitext(file_path)
-                    safe_uid = re.sub(r'[^a-zA-Z0-9_-]', '-', article_data.get('uid', uid))
+                    # Transformed paths always end in ".mdx", with no dot after it
+                    base, _, ext = file_path.rpartition('.')
+                    ext = '.' + ext
+                    safe_uid = _UID_UNSAFE_RE.sub('-', article_data.uid)
                     short = safe_uid[-8:]
                     file_path = f"{base}-{short}{ext}"
+                    n = 1
+                    while file_path in used_paths:
+                        n += 1
+                        file_path = f"{base}-{short}-{n}{ext}"
                 used_paths.add(file_path)
 
-                # Save MDX file
-                full_path = self.output_dir / file_path
-                full_path.parent.mkdir(parents=True, exist_ok=True)
+                full_path = os.path.join(out, file_path)
+                converted.append((uid, article_data, file_path, full_path, mdx_content, mintlify_frontmatter, None))
+
+            except Exception as e:
+                converted.append((uid, article_data, None, None, None, None, e))
+
+        for directory in {os.path.dirname(item[3]) for item in converted if item[6] is None}:
+            try:
+                self._ensure_dir(directory)
+            except OSError:
+                pass  # reported by the write of each article below
+
+        # Save MDX files on a thread pool (every path is distinct); results are
+        # reported in order below
+        writes = [(item[3], item[4]) for item in converted if item[6] is None]
+        with ThreadPoolExecutor(max_workers=WRITE_WORKERS) as executor:
+            write_errors = iter(list(executor.map(self._write_file, writes)))
+
+        for uid, article_data, file_path, full_path, mdx_content, mintlify_frontmatter, error in converted:
+            try:
+                if error is not None:
+                    raise error
 
-                with open(full_path, 'w', encoding='utf-8') as f:
-                    f.write(mdx_content)
+                write_error = next(write_errors)
+                if write_error is not None:
+                    raise write_error
+                self._written_frontmatter[os.path.normpath(full_path)] = mintlify_frontmatter
 
                 # Store file path for navigation
-                article_data['file_path'] = file_path
+                article_data.file_path = file_path
 
                 self.migration_stats['articles_processed'] += 1
-                print(f"  ✓ Converted: {article_data['metadata'].get('title', uid)}")
+                print(f"  ✓ Converted: {article_data.metadata.get('title', uid)}")
 
             except Exception as e:
                 self.migration_stats['errors'].append(
@@ -398,78 +1022,119 @@ class MintlifyMigrator:
                 )
                 print(f"  ✗ Error converting {uid}: {str(e)}")
 
+    @staticmethod
+    def _write_file(item: Tuple[str, str]) -> Optional[Exception]:
+        """Write one MDX file on a worker thread; returns None or the exception"""
+        path, text = item
+        try:
+            with open(path, 'wb') as f:
+                f.write(text.encode('utf-8'))
+            return None
+        except Exception as e:
+            return e
+
+    def _transform_task(self, task: Tuple[str, Dict, str]):
+        """Run _transform_article, returning (result, None) or (None, error)"""
+        try:
+            return self._transform_article(*task), None
+        except Exception as e:
+            return None, e
+
+    def _transform_all(self, tasks: List[Tuple[str, Dict, str]]):
+        """Transform (uid, metadata, content) tasks, in order, on worker processes when worthwhile
+
+        Workers only get the manifest path indexes; conversion must not rely on
+        any other migrator state.
+        """
+        if len(tasks) < TRANSFORM_POOL_MIN_ARTICLES:
+            return [self._transform_task(task) for task in tasks]
+        # No more processes than there are chunks to hand out; each one pays
+        # for interpreter startup and a copy of the manifest path indexes
+        chunks = -(-len(tasks) // TRANSFORM_CHUNKSIZE)
+        workers = min(os.cpu_count() or 1, chunks)
+        if sys.platform == 'win32':
+            workers = min(workers, 61)  # ProcessPoolExecutor's limit on Windows
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_transform_worker,
+            initargs=(type(self), self.path_by_numeric_id, self.path_by_slug),
+        ) as executor:
+            return list(executor.map(_transform_worker, tasks, chunksize=TRANSFORM_CHUNKSIZE))
+
     def transform_article_to_mdx(self, article_id: str, metadata: Dict, content: str) -> Tuple[str, str]:
         """Transform S3 article to Mintlify MDX format"""
+        file_path, mdx_output, _ = self._transform_article(article_id, metadata, content)
+        return file_path, mdx_output
+
+    def _transform_article(self, article_id: str, metadata: Dict, content: str) -> Tuple[str, str, Dict]:
+        """Transform an article, also returning the Mintlify frontmatter it was given"""
         
         # Parse existing frontmatter if present
         frontmatter = {}
         content_body = content
         
         if content.startswith('---'):
-            parts = content.split('---', 2)
-            if len(parts) >= 3:
+            # Slice around the second fence instead of splitting the whole body
+            fence_end = content.find('---', 3)
+            if fence_end != -1:
                 try:
-                    frontmatter = yaml.safe_load(parts[1])
-                    content_body = parts[2].strip()
+                    frontmatter = yaml.load(content[3:fence_end], Loader=YamlLoader)
+                    content_body = content[fence_end + 3:].strip()
                 except:
                     pass
         
+        metadata_get = metadata.get
+        
         # Build Mintlify frontmatter (metadata.json is canonical)
+        title = metadata_get('title', frontmatter.get('title', 'Untitled'))
         mintlify_frontmatter = {
-            'title': metadata.get('title', frontmatter.get('title', 'Untitled')),
+            'title': title,
             'description': self._generate_description(metadata, frontmatter, content_body),
         }
         
         # Add optional fields
-        if metadata.get('tags') and len(metadata['tags']) > 0:
+        tags = metadata_get('tags')
+        if tags and len(tags) > 0:
             # Use first tag as sidebar tag
-            mintlify_frontmatter['tag'] = metadata['tags'][0].upper()
+            mintlify_frontmatter['tag'] = tags[0].upper()
         
         # Generate sidebarTitle if main title is long
-        if len(mintlify_frontmatter['title']) > 30:
-            mintlify_frontmatter['sidebarTitle'] = self._truncate_title(mintlify_frontmatter['title'])
+        if len(title) > 30:
+            mintlify_frontmatter['sidebarTitle'] = self._truncate_title(title)
         
         # Add icon based on category
-        category = metadata.get('category', '').lower()
-        icon_map = {
-            'reports': 'chart-line',
-            'settings': 'gear', 
-            'tutorials': 'graduation-cap',
-            'troubleshooting': 'wrench',
-            'api': 'code',
-            'getting-started': 'rocket',
-            'general': 'book'
-        }
-        if category in icon_map:
-            mintlify_frontmatter['icon'] = icon_map[category]
+        icon = _CATEGORY_ICONS.get(metadata_get('category', '').lower())
+        if icon is not None:
+            mintlify_frontmatter['icon'] = icon
         
         # Convert content body
-        mdx_content = self._convert_content_to_mdx(content_body, metadata)
+        product = metadata_get('product', 'general').lower()
+        mdx_content = self._convert_content_to_mdx(content_body, metadata, product)
         
         # Generate final MDX
-        mdx_output = f"---\n{yaml.dump(mintlify_frontmatter, default_flow_style=False, allow_unicode=True)}---\n\n{mdx_content}"
+        mdx_output = f"---\n{_dump_frontmatter(mintlify_frontmatter)}---\n\n{mdx_content}"
         
         # Generate file path
-        product = metadata.get('product', 'general').lower()
+        section = metadata_get('section')
         # Prefer explicit category; if missing/null, use section; else general
-        preferred_category = metadata.get('category') or metadata.get('section') or 'general'
+        preferred_category = metadata_get('category') or section or 'general'
         category = self._sanitize_path(preferred_category)
-        section = metadata.get('section')
+        filename = self._generate_filename(metadata['title'])
         
         if section:
-            file_path = f"{product}/{category}/{self._sanitize_path(section)}/{self._generate_filename(metadata['title'])}.mdx"
+            file_path = f"{product}/{category}/{self._sanitize_path(section)}/{filename}.mdx"
         else:
-            file_path = f"{product}/{category}/{self._generate_filename(metadata['title'])}.mdx"
+            file_path = f"{product}/{category}/{filename}.mdx"
         
-        return file_path, mdx_output
+        return file_path, mdx_output, mintlify_frontmatter
 
-    def _convert_content_to_mdx(self, content: str, metadata: Dict) -> str:
+    def _convert_content_to_mdx(self, content: str, metadata: Dict, product: Optional[str] = None) -> str:
         """Convert markdown content to MDX with Mintlify components"""
         
         mdx = content
         
         # Convert media references
-        mdx = self._convert_media_references(mdx, metadata)
+        mdx = self._convert_media_references(mdx, metadata, product)
         # Convert article references to Mintlify root-relative links
         mdx = self._convert_article_references(mdx)
         
@@ -482,8 +1147,16 @@ class MintlifyMigrator:
         
         return mdx
 
-    def _convert_media_references(self, content: str, metadata: Dict) -> str:
-        """Convert kb://media/{id} references to local paths"""
+    def _convert_media_references(self, content: str, metadata: Dict, product: Optional[str] = None) -> str:
+        """Convert kb://media/{id} references to local paths
+
+        product is the lowercased product of the article, when the caller
+        already has it.
+        """
+        
+        # Determine product for organizing images
+        if product is None:
+            product = metadata.get('product', 'general').lower()
         
         def replace_media(match):
             media_ref = match.group(1)
@@ -491,9 +1164,6 @@ class MintlifyMigrator:
             # Normalize sha1: prefix
             media_id = media_id.replace('sha1:', '')
             
-            # Determine product for organizing images
-            product = metadata.get('product', 'general').lower()
-            
             # Generate local path
             # Assume .png extension if not specified
             if '.' not in media_id:
@@ -501,25 +1171,27 @@ class MintlifyMigrator:
             
             return f"/images/{product}/{media_id}"
         
+        # Each pass below only runs when the text it looks for is present;
+        # a substring test is much cheaper than a regex scan that finds nothing
+
         # Replace kb:// references
-        content = re.sub(r'kb://media/([^)]+)', replace_media, content)
+        if 'kb://media/' in content:
+            content = _MEDIA_REF_RE.sub(replace_media, content)
 
-        # Replace direct kb/media/... links
+        # Replace direct kb/media/... links (the match includes the parentheses)
         def replace_direct_media(match):
-            path = match.group(1)
-            filename = path.split('/')[-1]
-            product = metadata.get('product', 'general').lower()
-            return f"/images/{product}/{filename}"
+            filename = match.group(1).split('/')[-1]
+            return f"(/images/{product}/{filename})"
 
-        content = re.sub(r'\((?:https?://[^)]+/)?kb/media/([^ )]+)\)', lambda m: f"(/images/{metadata.get('product','general').lower()}/{m.group(1).split('/')[-1]})", content)
+        if 'kb/media/' in content:
+            content = _DIRECT_MEDIA_RE.sub(replace_direct_media, content)
         
         # Wrap standalone images in Frame components
-        content = re.sub(
-            r'^!\[([^\]]*)\]\(([^)]+)\)$',
-            r'<Frame>\n  <img src="\2" alt="\1" />\n</Frame>',
-            content,
-            flags=re.MULTILINE
-        )
+        if '![' in content:
+            content = _STANDALONE_IMG_RE.sub(
+                r'<Frame>\n  <img src="\2" alt="\1" />\n</Frame>',
+                content
+            )
         
         return content
 
@@ -545,54 +1217,51 @@ class MintlifyMigrator:
         - Markdown links to kb/articles/*.md
         - Zendesk /hc/*/articles/<id> links
         """
-        def path_from_numeric_id(numeric_id: str) -> Optional[str]:
-            item = self.manifest_by_numeric_id.get(str(numeric_id))
-            if not item:
-                return None
-            return self._compute_path_from_manifest_item(item)
+        # Paths were computed once per manifest item by _index_manifest_paths
+        path_by_numeric_id = self.path_by_numeric_id
+        path_from_slug = self.path_by_slug.get
 
-        def path_from_slug(slug: str) -> Optional[str]:
-            item = self.manifest_by_slug.get(slug)
-            if not item:
-                return None
-            return self._compute_path_from_manifest_item(item)
+        def path_from_numeric_id(numeric_id: str) -> Optional[str]:
+            return path_by_numeric_id.get(str(numeric_id))
 
         # {{article:...}}
         def replace_standardized(match):
             ref = match.group(1)
             # Try numeric id in [id]
-            id_match = re.search(r"\[(\d+)\]", ref)
+            id_match = _BRACKET_ID_RE.search(ref)
             out_path = None
             if id_match:
                 out_path = path_from_numeric_id(id_match.group(1))
             if not out_path:
                 # Try slug before [
-                m = re.match(r"(.+?) \[\d+\]\.md$", ref)
+                m = _MD_SLUG_RE.match(ref)
                 if m:
                     out_path = path_from_slug(m.group(1))
             if not out_path:
                 return match.group(0)
             return f"[{os.path.basename(out_path)}](/" + out_path + ")"
 
-        content = re.sub(r"\{\{article:([^}]+)\}\}", replace_standardized, content)
+        if '{{article:' in content:
+            content = _ARTICLE_TAG_RE.sub(replace_standardized, content)
 
         # Markdown links to kb/articles/*.md
         def replace_kb_articles_link(match):
             text = match.group(1)
             target = match.group(2)
-            id_match = re.search(r"\[(\d+)\]\.md$", target)
+            id_match = _MD_ID_SUFFIX_RE.search(target)
             out_path = None
             if id_match:
                 out_path = path_from_numeric_id(id_match.group(1))
             if not out_path:
-                m = re.match(r"kb/articles/(.+?) \[\d+\]\.md$", target)
+                m = _KB_ARTICLE_SLUG_RE.match(target)
                 if m:
                     out_path = path_from_slug(m.group(1))
             if out_path:
                 return f"[{text}](/" + out_path + ")"
             return match.group(0)
 
-        content = re.sub(r"\[([^\]]+)\]\((?:https?://[^)]*/)?kb/articles/[^)]+\)", replace_kb_articles_link, content)
+        if 'kb/articles/' in content:
+            content = _KB_ARTICLE_LINK_RE.sub(replace_kb_articles_link, content)
 
         # Zendesk article URLs
         def replace_zendesk_link(match):
@@ -603,36 +1272,20 @@ class MintlifyMigrator:
                 return f"[{text}](/" + out_path + ")"
             return match.group(0)
 
-        content = re.sub(r"\[([^\]]+)\]\([^)]*/articles/(\d+)[^)]*\)", replace_zendesk_link, content)
+        if '/articles/' in content:
+            content = _ZENDESK_LINK_RE.sub(replace_zendesk_link, content)
 
         return content
 
     def _enhance_with_components(self, content: str) -> str:
         """Add Mintlify-specific MDX components"""
         
-        # Convert note patterns to Note components
-        content = re.sub(
-            r'^> \*\*Note:\*\* (.+)$',
-            r'<Note>\n  \1\n</Note>',
-            content,
-            flags=re.MULTILINE
-        )
-        
-        # Convert warning patterns
-        content = re.sub(
-            r'^> \*\*Warning:\*\* (.+)$', 
-            r'<Warning>\n  \1\n</Warning>',
-            content,
-            flags=re.MULTILINE
-        )
-        
-        # Convert tip patterns
-        content = re.sub(
-            r'^> \*\*Tip:\*\* (.+)$',
-            r'<Tip>\n  \1\n</Tip>',
-            content,
-            flags=re.MULTILINE
-        )
+        # Convert note, warning and tip patterns to their components in one pass
+        if '> **' in content:
+            content = _ADMONITION_RE.sub(
+                r'<\1>\n  \2\n</\1>',
+                content
+            )
         
         # Convert numbered steps to Steps component (if 3+ steps)
         content = self._convert_to_steps(content)
@@ -642,16 +1295,22 @@ class MintlifyMigrator:
     def _convert_to_steps(self, content: str) -> str:
         """Convert numbered lists to Steps components"""
         
-        # Find numbered list blocks
-        pattern = r'((?:^\d+\. .+$\n?)+)'
+        # Every step line contains "N. ", so fewer than three means nothing to convert
+        if content.count('. ') < 3:
+            return content
         
         def replace_steps(match):
             steps_text = match.group(1)
-            steps = re.findall(r'^\d+\. (.+)$', steps_text, re.MULTILINE)
+            # Every line of the block is "<digits>. <text>", so the lines are
+            # the steps and the first ". " ends each number
+            lines = steps_text.split('\n')
+            if not lines[-1]:
+                lines.pop()
             
-            if len(steps) < 3:  # Only convert if 3+ steps
+            if len(lines) < 3:  # Only convert if 3+ steps
                 return match.group(0)
             
+            steps = [line.partition('. ')[2] for line in lines]
             mdx_steps = ['<Steps>']
             for step in steps:
                 # Simple conversion - could be enhanced
@@ -661,7 +1320,8 @@ class MintlifyMigrator:
             
             return '\n'.join(mdx_steps)
         
-        return re.sub(pattern, replace_steps, content, flags=re.MULTILINE)
+        # Find numbered list blocks
+        return _STEP_BLOCK_RE.sub(replace_steps, content)
 
     def _add_suggested_queries(self, content: str, queries: List[str]) -> str:
         """Add suggested queries as FAQ section"""
@@ -684,76 +1344,136 @@ class MintlifyMigrator:
     def download_media_files(self):
         """Download media files from S3
 
-        Collects media IDs from both metadata and inline `kb://media/...`
-        and `kb/media/...` references within article content.
+        Downloads every media file in self.article_by_media, which holds the
+        IDs referenced by article metadata and inline `kb://media/...` and
+        `kb/media/...` links, into the images folder of the first article's product.
         """
 
-        # Get list of all media files referenced in articles
-        referenced_media = set()
-        media_ref_pattern = re.compile(r'kb://media/([^\s)]+)')
-        direct_media_pattern = re.compile(r'\((?:https?://[^)]+/)?kb/media/([^ )]+)\)')
-        for article in self.articles.values():
-            # From metadata
-            media_ids = article['metadata'].get('media_ids', [])
-            for mid in media_ids:
-                clean = str(mid).replace('sha1:', '')
-                referenced_media.add(clean)
-            # From inline content
-            for match in media_ref_pattern.findall(article.get('content', '')):
-                referenced_media.add(match.split('/')[-1].replace('sha1:', ''))
-            for match in direct_media_pattern.findall(article.get('content', '')):
-                referenced_media.add(match.split('/')[-1])
-
-        # Download referenced media
-        for media_id in referenced_media:
+        # Resolve local paths up front; downloads then run on a thread pool
+        images_dir = os.path.join(str(self.output_dir), 'images')
+        downloads = []
+        planned_paths = set()
+        # Product folder of each owning article, looked up once per article
+        product_by_uid = {}
+        # File names already in each product folder, listed once per folder
+        existing_by_product = {}
+        for media_id, article in self.article_by_media.items():
             try:
-                # Try to download directly by canonical location
-                found = False
-                canonical_key = f"{self.prefix}media/{media_id}"
                 # Determine product folder for local organization
-                product = 'general'
-                for article in self.articles.values():
-                    mi = [str(m).replace('sha1:', '') for m in article['metadata'].get('media_ids', [])]
-                    if media_id in mi or media_id in article.get('content', ''):
-                        product = article['metadata'].get('product', 'general').lower()
-                        break
+                product = product_by_uid.get(article.uid)
+                if product is None:
+                    product = product_by_uid[article.uid] = article.metadata.get('product', 'general').lower()
+
+                existing = existing_by_product.get(product)
+                if existing is None:
+                    existing = existing_by_product[product] = self._existing_file_names(os.path.join(images_dir, product))
 
                 filename = media_id.split('/')[-1]
-                local_path = self.output_dir / 'images' / product / filename
-                # Skip if already downloaded
-                if local_path.exists():
+                local_path = os.path.join(images_dir, product, filename)
+                planned_key = local_path.casefold() if CASE_INSENSITIVE_FS else local_path
+                # Skip if already downloaded (or already queued under another id).
+                # The listed names are compared exactly; a name that is not
+                # listed still gets os.path.exists, which knows whether the file
+                # system ignores case (and resolves separators in filename)
+                if planned_key in planned_paths or filename in existing or os.path.exists(local_path):
                     continue
-                local_path.parent.mkdir(parents=True, exist_ok=True)
+                planned_paths.add(planned_key)
+                self._ensure_dir(os.path.dirname(local_path))
+                downloads.append((media_id, filename, local_path))
 
-                try:
-                    self.s3_client.download_file(self.bucket, canonical_key, str(local_path))
-                    self.migration_stats['media_processed'] += 1
-                    print(f"  ✓ Downloaded: {filename}")
-                    found = True
-                except ClientError:
-                    # Fallback: search under all kb/media/ prefixes (including dated)
-                    paginator = self.s3_client.get_paginator('list_objects_v2')
-                    pages = paginator.paginate(Bucket=self.bucket, Prefix=f"{self.prefix}media/")
-                    for page in pages:
-                        if 'Contents' not in page:
-                            continue
-                        for obj in page['Contents']:
-                            key = obj['Key']
-                            if key.endswith(filename):
-                                self.s3_client.download_file(self.bucket, key, str(local_path))
-                                self.migration_stats['media_processed'] += 1
-                                print(f"  ✓ Downloaded: {filename}")
-                                found = True
-                                break
-                        if found:
-                            break
-
-                if not found:
-                    self.migration_stats['warnings'].append(f"Media not found: {media_id}")
-                    
             except Exception as e:
                 self.migration_stats['errors'].append(f"Error downloading media {media_id}: {str(e)}")
 
+        # Built on the first miss, by whichever worker gets there first
+        key_index = None
+        key_index_lock = threading.Lock()
+
+        def fallback_key(filename: str) -> Optional[str]:
+            nonlocal key_index
+            with key_index_lock:
+                if key_index is None:
+                    key_index = self._media_key_index()
+            media_keys, media_keys_by_name = key_index
+            key = media_keys_by_name.get(filename)
+            if key is None:
+                key = next((k for k in media_keys if k.endswith(filename)), None)
+            return key
+
+        def download(item):
+            media_id, filename, local_path = item
+            # Try to download directly by canonical location
+            result = self._download_object((f"{self.prefix}media/{media_id}", local_path))
+            if isinstance(result, ClientError):
+                # Fallback: search under all kb/media/ prefixes (including dated)
+                # using the listing cached by load_media_metadata. Retried right
+                # away, without waiting for the other canonical downloads
+                key = fallback_key(filename)
+                result = False if key is None else self._download_object((key, local_path))
+            return result
+
+        with self._s3_executor() as executor:
+            results = list(executor.map(download, downloads))
+
+        for (media_id, filename, _), result in zip(downloads, results):
+            if isinstance(result, Exception):
+                self.migration_stats['errors'].append(f"Error downloading media {media_id}: {str(result)}")
+            elif result:
+                self.migration_stats['media_processed'] += 1
+                print(f"  ✓ Downloaded: {filename}")
+            else:
+                self.migration_stats['warnings'].append(f"Media not found: {media_id}")
+
+    @staticmethod
+    def _existing_file_names(directory: str) -> set:
+        """Names in directory that os.path.exists would report, from one scandir"""
+        try:
+            with os.scandir(directory) as entries:
+                # Broken symlinks do not count as existing
+                return {entry.name for entry in entries if not entry.is_symlink() or os.path.exists(entry.path)}
+        except (FileNotFoundError, NotADirectoryError):
+            return set()
+
+    def _index_media_references(self) -> Dict[str, Article]:
+        """Map each referenced media id to the first article that references it
+
+        Collects media IDs from both metadata and inline `kb://media/...`
+        and `kb/media/...` references within article content.
+        """
+        media_owner = {}
+        for article in self.articles.values():
+            # From metadata
+            refs = [str(mid).replace('sha1:', '') for mid in article.metadata.get('media_ids', [])]
+            # From inline content; most articles have no media links at all,
+            # which one substring test settles before any regex scan
+            content = article.content
+            if 'media/' in content:
+                if 'kb://media/' in content:
+                    refs.extend(match.split('/')[-1].replace('sha1:', '') for match in _MEDIA_REF_ID_RE.findall(content))
+                if 'kb/media/' in content:
+                    refs.extend(match.split('/')[-1] for match in _DIRECT_MEDIA_RE.findall(content))
+            for mid in refs:
+                media_owner.setdefault(mid, article)
+        return media_owner
+
+    def _download_object(self, item: Tuple[str, str]):
+        """Download one S3 key to a local path on a worker thread; returns True or the exception"""
+        key, local_path = item
+        try:
+            self.s3_client.download_file(self.bucket, key, local_path, Config=TRANSFER_CONFIG)
+            return True
+        except Exception as e:
+            return e
+
+    def _media_key_index(self) -> Tuple[List[str], Dict[str, str]]:
+        """Every key under media/, plus the first key for each file name"""
+        if self._media_listing is None:
+            self._media_listing = [obj['Key'] for obj in self._list_objects(f"{self.prefix}media/")]
+        media_keys = self._media_listing
+        by_name = {}
+        for key in media_keys:
+            by_name.setdefault(key.rsplit('/', 1)[-1], key)
+        return media_keys, by_name
+
     def generate_navigation_config(self):
         """Generate docs.json configuration file"""
         
@@ -787,37 +1507,35 @@ class MintlifyMigrator:
             ]}
         }
         
+        # Group articles by product and category in a single pass
+        categories_by_product = {'radix': defaultdict(list), 'rediq': defaultdict(list)}
+        for article_id, article_data in self.articles.items():
+            md = article_data.metadata
+            categories = categories_by_product.get(md.get('product', '').lower())
+            if categories is None:
+                continue
+            
+            if article_data.file_path is None:
+                continue
+            
+            # Prefer category; fall back to section; then general
+            section = md.get('section')
+            category = md.get('category') or section or 'general'
+            
+            # Remove .mdx extension for navigation
+            page_path = article_data.file_path.replace('.mdx', '')
+            categories[category].append({
+                'path': page_path,
+                'title': md.get('title', 'Untitled'),
+                'section': section
+            })
+        
         # Build navigation for each product
-        for product in ['radix', 'rediq']:
+        for product, categories in categories_by_product.items():
             product_groups = []
             
-            # Group articles by category
-            categories = {}
-            for article_id, article_data in self.articles.items():
-                if article_data['metadata'].get('product', '').lower() != product:
-                    continue
-                
-                if 'file_path' not in article_data:
-                    continue
-                
-                # Prefer category; fall back to section; then general
-                category = article_data['metadata'].get('category') or article_data['metadata'].get('section') or 'general'
-                
-                if category not in categories:
-                    categories[category] = []
-                
-                # Remove .mdx extension for navigation
-                page_path = article_data['file_path'].replace('.mdx', '')
-                categories[category].append({
-                    'path': page_path,
-                    'title': article_data['metadata'].get('title', 'Untitled'),
-                    'section': article_data['metadata'].get('section')
-                })
-            
             # Create groups for each category
-            for category in sorted(categories.keys()):
-                pages = categories[category]
-                
+            for category, pages in sorted(categories.items()):
                 # Sort pages by title
                 pages.sort(key=lambda x: x['title'])
                 
@@ -844,8 +1562,11 @@ class MintlifyMigrator:
         
         # Save docs.json
         docs_json_path = self.output_dir / 'docs.json'
-        with open(docs_json_path, 'w', encoding='utf-8') as f:
-            json.dump(config, f, indent=2, ensure_ascii=False)
+        if _json_fast is not None:
+            # Same bytes as json.dumps(indent=2, ensure_ascii=False), serialized in C
+            self._write_bytes_atomic(docs_json_path, _json_fast.dumps(config, option=_json_fast.OPT_INDENT_2))
+        else:
+            self._write_bytes_atomic(docs_json_path, json.dumps(config, indent=2, ensure_ascii=False).encode('utf-8'))
         
         total_groups = sum(len(t['groups']) for t in config['navigation']['tabs'])
         print(f"  ✓ Generated docs.json with {total_groups} groups across {len(config['navigation']['tabs'])} tabs")
@@ -893,38 +1614,61 @@ Browse our most frequently accessed documentation:
 """
         
         index_path = self.output_dir / 'index.mdx'
-        with open(index_path, 'w', encoding='utf-8') as f:
-            f.write(index_content)
+        self._write_bytes_atomic(index_path, index_content.encode('utf-8'))
         
         print("  ✓ Created index.mdx")
 
     def validate_migration(self):
-        """Validate the migrated content"""
+        """Validate the migrated content
+
+        Files written by convert_articles are checked against the frontmatter
+        recorded when they were written; any other MDX file is read and parsed.
+        """
         
         # Check all MDX files
-        mdx_files = list(self.output_dir.rglob('*.mdx'))
-        
+        mdx_files = []
+        to_read = []
+        for root, _dirs, files in os.walk(self.output_dir):
+            for name in files:
+                if not name.endswith('.mdx'):
+                    continue
+                mdx_file = os.path.join(root, name)
+                mdx_files.append(mdx_file)
+                if self._written_frontmatter.get(os.path.normpath(mdx_file)) is None:
+                    to_read.append(mdx_file)
+
+        # Read and parse the other files up front, on worker processes when
+        # there are enough of them
+        if len(to_read) < VALIDATE_POOL_MIN_FILES:
+            parsed = dict(zip(to_read, map(_read_frontmatter, to_read)))
+        else:
+            chunks = -(-len(to_read) // VALIDATE_CHUNKSIZE)
+            workers = min(os.cpu_count() or 1, chunks)
+            if sys.platform == 'win32':
+                workers = min(workers, 61)  # ProcessPoolExecutor's limit on Windows
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                parsed = dict(zip(to_read, executor.map(_read_frontmatter, to_read, chunksize=VALIDATE_CHUNKSIZE)))
+
         for mdx_file in mdx_files:
             try:
-                with open(mdx_file, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Check for frontmatter
-                if not content.startswith('---'):
-                    self.migration_stats['warnings'].append(f"Missing frontmatter: {mdx_file}")
-                    continue
-                
-                # Parse frontmatter
-                parts = content.split('---', 2)
-                if len(parts) >= 3:
-                    fm = yaml.safe_load(parts[1])
-                    
-                    # Check required fields
-                    if 'title' not in fm:
-                        self.migration_stats['errors'].append(f"Missing title: {mdx_file}")
-                    if 'description' not in fm:
-                        self.migration_stats['warnings'].append(f"Missing description: {mdx_file}")
+                fm = self._written_frontmatter.get(os.path.normpath(mdx_file))
+                if fm is None:
+                    status, fm = parsed[mdx_file]
+                    if status == 'missing':
+                        self.migration_stats['warnings'].append(f"Missing frontmatter: {mdx_file}")
+                        continue
+                    if status == 'unterminated':
+                        continue
+                    if status == 'error':
+                        self.migration_stats['errors'].append(f"Validation error in {mdx_file}: {fm}")
+                        continue
                 
+                # Check required fields
+                if 'title' not in fm:
+                    self.migration_stats['errors'].append(f"Missing title: {mdx_file}")
+                if 'description' not in fm:
+                    self.migration_stats['warnings'].append(f"Missing description: {mdx_file}")
+            
             except Exception as e:
                 self.migration_stats['errors'].append(f"Validation error in {mdx_file}: {str(e)}")
 
@@ -969,7 +1713,7 @@ Browse our most frequently accessed documentation:
         # Try to extract from content
         if content:
             # Remove markdown formatting
-            clean_content = re.sub(r'[#*_`\[\]<!->]', '', content)
+            clean_content = _DESC_STRIP_RE.sub('', content)
             # Get first meaningful paragraph
             paragraphs = clean_content.split('\n\n')
             for p in paragraphs:
@@ -1000,25 +1744,11 @@ Browse our most frequently accessed documentation:
 
     def _generate_filename(self, title: str) -> str:
         """Generate URL-safe filename from title"""
-        
-        # Remove special characters and convert to lowercase
-        filename = re.sub(r'[^\w\s-]', '', title.lower())
-        # Replace spaces with hyphens
-        filename = re.sub(r'[-\s]+', '-', filename)
-        # Remove leading/trailing hyphens
-        return filename.strip('-')[:50]  # Limit length
+        return _filename_from_title(title)
 
     def _sanitize_path(self, path: str) -> str:
         """Sanitize path component"""
-        
-        if not path:
-            return 'general'
-        
-        # Convert to lowercase and replace special chars
-        sanitized = re.sub(r'[^\w-]', '-', path.lower())
-        # Remove multiple hyphens
-        sanitized = re.sub(r'-+', '-', sanitized)
-        return sanitized.strip('-')
+        return _sanitized_path(path)
 
     def _format_group_name(self, name: str) -> str:
         """Format category name for display"""
@@ -1037,15 +1767,24 @@ def main():
     parser.add_argument('--prefix', default='kb/', help='S3 prefix (default: kb/)')
     parser.add_argument('--output', default='./mintlify-docs', help='Output directory')
     parser.add_argument('--profile', help='AWS profile name')
+    parser.add_argument('--cache-dir', help='Reuse unchanged S3 objects downloaded by earlier runs from this directory')
     
     args = parser.parse_args()
     
+    # Ensure printing doesn't fail on Windows consoles without UTF-8; set once
+    # here instead of re-encoding every printed line
+    try:
+        sys.stdout.reconfigure(encoding='utf-8', errors='replace')
+    except AttributeError:  # stdout replaced by something that is not a TextIOWrapper
+        pass
+    
     # Run migration
     migrator = MintlifyMigrator(
         bucket=args.bucket,
         prefix=args.prefix,
         output_dir=args.output,
-        aws_profile=args.profile
+        aws_profile=args.profile,
+        cache_dir=args.cache_dir
     )
     
     migrator.run_migration()
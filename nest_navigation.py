@@ -1,5 +1,12 @@
 import json
-from collections import OrderedDict
+
+try:
+	import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+	_json_fast = None
+
+# docs.json is read and written in one go through a 1 MiB buffer
+IO_BUFFER_SIZE = 1 << 20
 
 
 def build_nested_pages(pages):
@@ -11,8 +18,8 @@ def build_nested_pages(pages):
 	  group those pages by the first remaining segment after 'product/topGroup'.
 	- Preserve original order of first appearance for subgroups and pages.
 	"""
-	# Maintain insertion order for subgroups and also collect top-level pages
-	subgroup_to_pages = OrderedDict()
+	# Plain dicts keep insertion order, so subgroups stay in order of first appearance
+	subgroup_to_pages = {}
 	root_level_pages = []
 
 	for p in pages:
@@ -21,35 +28,24 @@ def build_nested_pages(pages):
 			root_level_pages.append(p)
 			continue
 
-		segments = p.split('/')
-		if len(segments) < 3:
-			# Not enough segments to create a subgroup; keep at root
-			root_level_pages.append(p)
-			continue
-
-		# product = segments[0]
-		# top_group = segments[1]
-		rest = segments[2:]
-		if len(rest) == 1:
-			# No subgroup, just a slug
+		# product/topGroup/rest; only the subgroup segment is needed, so split at most 3 times
+		segments = p.split('/', 3)
+		if len(segments) < 4:
+			# No subgroup (fewer than 3 segments, or just product/topGroup/slug); keep at root
 			root_level_pages.append(p)
 			continue
 
-		subgroup = rest[0]
-		if subgroup not in subgroup_to_pages:
-			subgroup_to_pages[subgroup] = []
-		subgroup_to_pages[subgroup].append(p)
+		subgroup_to_pages.setdefault(segments[2], []).append(p)
 
 	# Compose final pages array: keep any top-level strings/objects first,
 	# then append subgroup objects in the order they appeared.
-	result_pages = list(root_level_pages)
-	for subgroup, paths in subgroup_to_pages.items():
-		result_pages.append({
+	return root_level_pages + [
+		{
 			"group": subgroup,
 			"pages": paths,
-		})
-
-	return result_pages
+		}
+		for subgroup, paths in subgroup_to_pages.items()
+	]
 
 
 def transform_docs_json(doc):
@@ -72,13 +68,16 @@ def transform_docs_json(doc):
 
 
 def main():
-	with open("docs.json", "r", encoding="utf-8") as f:
-		doc = json.load(f)
+	with open("docs.json", "rb", buffering=IO_BUFFER_SIZE) as f:
+		raw = f.read()
+	doc = _json_fast.loads(raw) if _json_fast is not None else json.loads(raw)
 
 	doc = transform_docs_json(doc)
 
-	with open("docs.json", "w", encoding="utf-8") as f:
-		json.dump(doc, f, indent=4, ensure_ascii=False)
+	# orjson can only indent by 2, so output stays on stdlib json to keep docs.json's 4-space layout.
+	# Serialize to one string and write it once instead of json.dump's per-token writes.
+	with open("docs.json", "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+		f.write(json.dumps(doc, indent=4, ensure_ascii=False))
 
 
 if __name__ == "__main__":
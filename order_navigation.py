@@ -1,112 +1,123 @@
 import json
 import os
 import re
-from typing import Any, Dict, List, Tuple, Union
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+	import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+	_json_fast = None
 
 
 Page = Union[str, Dict[str, Any]]
 
+# docs.json is read and written in one go through a 1 MiB buffer
+IO_BUFFER_SIZE = 1 << 20
+
+
+def _keyword_regex(keywords: List[Union[str, Tuple[str, ...]]]) -> "re.Pattern[str]":
+	"""Compile a pattern matching any of the keywords as a plain substring.
+
+	A tuple entry matches when all of its keywords occur, in any order.
+	"""
+	alternatives = []
+	for keyword in keywords:
+		if isinstance(keyword, tuple):
+			alternatives.append(r"\A" + "".join(f"(?=.*?{re.escape(k)})" for k in keyword))
+		else:
+			alternatives.append(re.escape(keyword))
+	return re.compile("|".join(alternatives), re.DOTALL)
 
+
+# compute_priority rules: (group the rule is limited to or None, slug pattern,
+# whether the title is matched too, score delta). Each matching rule applies once.
+_PRIORITY_RULES: List[Tuple[Optional[str], "re.Pattern[str]", bool, int]] = [
+	# Generic early items
+	(None, _keyword_regex(["overview", "introduction", "what is", "about"]), True, -600),
+	(None, _keyword_regex(["getting-started", "gettingstarted", "setup", "set-up", "installation", "account-setup", "accountsetup"]), False, -500),
+	# Generic late items
+	(None, _keyword_regex(["faq", "faqs", "troubleshooting"]), True, +250),
+	(None, _keyword_regex(["beta"]), False, +120),
+	(None, _keyword_regex(["delete", "remov", "deprecate"]), False, +60),
+	# Core navigation flow for deals
+	# Deal log, page, headers, name tab, action menu, settings/filters, create, share, reports, special cases
+	("deals", _keyword_regex(["deal-log"]), False, -400),
+	("deals", _keyword_regex(["deal-page"]), False, -390),
+	("deals", _keyword_regex(["deal-headers"]), False, -380),
+	("deals", _keyword_regex(["name-tab"]), False, -370),
+	("deals", _keyword_regex(["deal-action-menu"]), False, -360),
+	("deals", _keyword_regex(["search-setting-filters", ("filter", "deal")]), False, -350),
+	("deals", _keyword_regex(["how-to-create", ("create", "deal")]), False, -340),
+	("deals", _keyword_regex(["share-deal"]), False, -330),
+	# Reports later
+	("deals", _keyword_regex(["comp-report", "expense-and-rent-comp-report", "pipeline-report"]), False, +40),
+	# Segment-specific late items
+	("deals", _keyword_regex(["student-housing", "single-family", "sfr-"]), False, +80),
+]
+
+
+@lru_cache(maxsize=None)
 def read_title_for_page(path_without_ext: str) -> str:
 	"""Attempt to read a human title from the MDX file.
 
 	Strategies:
 	- Look for first markdown heading '# ' or '## ' line
 	- Fallback to filename slug
+
+	Results are cached; a page listed in several groups is read once.
 	"""
 	candidate_paths = [f"{path_without_ext}.mdx", f"{path_without_ext}.md"]
 	for p in candidate_paths:
-		if os.path.exists(p):
-			try:
-				with open(p, "r", encoding="utf-8") as f:
-					for line in f:
-						line_stripped = line.strip()
-						if line_stripped.startswith("# ") or line_stripped.startswith("## "):
-							return line_stripped.lstrip("# ").strip()
-			except Exception:
-				pass
+		# A missing file fails the open just like the exists() check did
+		try:
+			with open(p, "r", encoding="utf-8") as f:
+				for line in f:
+					line_stripped = line.strip()
+					if line_stripped.startswith("# ") or line_stripped.startswith("## "):
+						return line_stripped.lstrip("# ").strip()
+		except Exception:
+			pass
 	# Fallback to last segment slug
 	return os.path.basename(path_without_ext)
 
 
 def compute_priority(slug: str, title: str, group_name: str) -> int:
 	"""Lower score means earlier appearance.
-	Combine generic heuristics and group-specific tweaks.
+	Combine generic heuristics and group-specific tweaks from _PRIORITY_RULES.
 	"""
 	slug_l = slug.lower()
 	title_l = title.lower()
+	group_l = group_name.lower()
 
 	score = 1000
-
-	def bump(delta: int):
-		nonlocal score
-		score += delta
-
-	# Generic early items
-	if any(k in slug_l or k in title_l for k in ["overview", "introduction", "what is", "about"]):
-		bump(-600)
-	if any(k in slug_l for k in ["getting-started", "gettingstarted", "setup", "set-up", "installation", "account-setup", "accountsetup"]):
-		bump(-500)
-
-	# Generic late items
-	if any(k in slug_l or k in title_l for k in ["faq", "faqs", "troubleshooting"]):
-		bump(+250)
-	if "beta" in slug_l:
-		bump(+120)
-	if any(k in slug_l for k in ["delete", "remov", "deprecate"]):
-		bump(+60)
-
-	# Group-specific ordering
-	if group_name.lower() == "deals":
-		# Core navigation flow for deals
-		# Deal log, page, headers, name tab, action menu, settings/filters, create, share, reports, special cases
-		if "deal-log" in slug_l:
-			bump(-400)
-		if "deal-page" in slug_l:
-			bump(-390)
-		if "deal-headers" in slug_l:
-			bump(-380)
-		if "name-tab" in slug_l:
-			bump(-370)
-		if "deal-action-menu" in slug_l:
-			bump(-360)
-		if "search-setting-filters" in slug_l or ("filter" in slug_l and "deal" in slug_l):
-			bump(-350)
-		if "how-to-create" in slug_l or ("create" in slug_l and "deal" in slug_l):
-			bump(-340)
-		if "share-deal" in slug_l:
-			bump(-330)
-		# Reports later
-		if any(k in slug_l for k in ["comp-report", "expense-and-rent-comp-report", "pipeline-report"]):
-			bump(+40)
-		# Segment-specific late items
-		if any(k in slug_l for k in ["student-housing", "single-family", "sfr-"]):
-			bump(+80)
+	for group, pattern, match_title, delta in _PRIORITY_RULES:
+		if group is not None and group != group_l:
+			continue
+		if pattern.search(slug_l) or (match_title and pattern.search(title_l)):
+			score += delta
 
 	return score
 
 
 def reorder_pages(pages: List[Page], group_name: str) -> List[Page]:
-	# Build sortable list with computed score; keep stable by original index
-	scored: List[Tuple[int, int, Page]] = []
-	for idx, item in enumerate(pages):
+	# One score per item; the sort is stable, so ties keep their original order
+	scores: List[int] = []
+	for item in pages:
 		if isinstance(item, str):
 			slug = item
 			title = read_title_for_page(item)
-			score = compute_priority(slug, title, group_name)
-			scored.append((score, idx, item))
+			scores.append(compute_priority(slug, title, group_name))
 		else:
 			# Nested subgroup
 			subgroup_name = item.get("group", group_name)
 			subpages = item.get("pages", [])
 			item["pages"] = reorder_pages(subpages, subgroup_name)
 			# Score subgroup itself by generic heuristics on group name
-			score = compute_priority(subgroup_name, subgroup_name, group_name)
-			scored.append((score, idx, item))
+			scores.append(compute_priority(subgroup_name, subgroup_name, group_name))
 
-	# Sort by (score, original_index) for stable ordering
-	scored.sort(key=lambda t: (t[0], t[1]))
-	return [it for _, __, it in scored]
+	order = sorted(range(len(pages)), key=scores.__getitem__)
+	return [pages[i] for i in order]
 
 
 def transform_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
@@ -123,13 +134,16 @@ def transform_doc(doc: Dict[str, Any]) -> Dict[str, Any]:
 
 
 def main():
-	with open("docs.json", "r", encoding="utf-8") as f:
-		doc = json.load(f)
+	with open("docs.json", "rb", buffering=IO_BUFFER_SIZE) as f:
+		raw = f.read()
+	doc = _json_fast.loads(raw) if _json_fast is not None else json.loads(raw)
 
 	doc = transform_doc(doc)
 
-	with open("docs.json", "w", encoding="utf-8") as f:
-		json.dump(doc, f, indent=4, ensure_ascii=False)
+	# orjson can only indent by 2, so output stays on stdlib json to keep docs.json's 4-space layout.
+	# Serialize to one string and write it once instead of json.dump's per-token writes.
+	with open("docs.json", "w", encoding="utf-8", buffering=IO_BUFFER_SIZE) as f:
+		f.write(json.dumps(doc, indent=4, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -0,0 +1,55 @@
+"""Directory walking shared by the docs scripts and tools/"""
+import os
+from typing import Iterator, List, Tuple
+
+
+def walk_entries(root, skip_hidden: bool = False) -> Iterator[Tuple[str, List[os.DirEntry]]]:
+    """Yield (directory, entries that are not directories) for root and each directory below it
+
+    Same directories, in the same order, as os.walk(root) and Path.rglob: a
+    directory comes before its subdirectories, which are visited in listing
+    order. Each directory is listed with one scandir and every DirEntry already
+    knows its type, so nothing is stat'ed. Symlinked directories are listed as
+    directories but not descended into, and directories that cannot be listed
+    are skipped. With skip_hidden, names starting with "." are left out, as
+    glob's "**" does.
+    """
+    files: List[os.DirEntry] = []
+    subdirs: List[str] = []
+    try:
+        with os.scandir(root) as entries:
+            for entry in entries:
+                if skip_hidden and entry.name.startswith("."):
+                    continue
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    files.append(entry)
+                elif not entry.is_symlink():
+                    subdirs.append(entry.path)
+    except OSError:
+        return
+    yield os.fspath(root), files
+    for subdir in subdirs:
+        yield from walk_entries(subdir, skip_hidden)
+
+
+def iter_files(root, skip_hidden: bool = False) -> Iterator[str]:
+    """Paths of the regular files (or symlinks to them) under root, in walk_entries order"""
+    for _directory, entries in walk_entries(root, skip_hidden):
+        for entry in entries:
+            try:
+                if entry.is_file():
+                    yield entry.path
+            except OSError:
+                continue
+
+
+def iter_mdx(root, skip_hidden: bool = False) -> Iterator[str]:
+    """Paths of the .mdx files (any case) under root, in walk_entries order"""
+    for _directory, entries in walk_entries(root, skip_hidden):
+        for entry in entries:
+            if entry.name.lower().endswith(".mdx"):
+                yield entry.path
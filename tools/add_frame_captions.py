@@ -1,16 +1,35 @@
 import argparse
+import concurrent.futures
 import json
+import mmap
 import os
 import re
-from typing import Dict, List, Tuple
+import sys
+from pathlib import Path
+from typing import Dict, List, Optional, Set, Tuple
 
+# Shared helpers live at the repo root, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scan_tree import iter_mdx
 
-FRAME_BLOCK_REGEX = re.compile(r"<Frame\b[^>]*>.*?</Frame>", re.DOTALL)
-FRAME_OPEN_TAG_REGEX = re.compile(r"<Frame\b[^>]*>", re.DOTALL)
+
+FRAME_BLOCK_REGEX = re.compile(r"(?P<open><Frame\b[^>]*>).*?</Frame>", re.DOTALL)
 IMG_SRC_REGEX = re.compile(r"<img\b[^>]*\bsrc\s*=\s*['\"]([^'\"]+)['\"]", re.IGNORECASE)
+CAPTION_ATTR_REGEX = re.compile(r"\bcaption\s*=")
+IMG_TAG_BYTES_REGEX = re.compile(rb"<img\b", re.IGNORECASE)
+# A media id is looked up as the basename of a quoted src cut at '?', so it is
+# always one of the pieces of the page split on these characters (plus the
+# backslash on Windows, where os.path.basename also splits there)
+MEDIA_ID_DELIMITER_BYTES_REGEX = re.compile(
+    rb"['\"?" + re.escape((os.path.sep + (os.path.altsep or "")).encode()) + rb"]"
+)
 
 
-def load_media_captions(media_jsonl_path: str) -> Dict[str, str]:
+def load_media_captions(media_jsonl_path: str, referenced: Optional[Set[bytes]] = None) -> Dict[str, str]:
+    """
+    Map media_id -> caption. With referenced (see referenced_names), captions
+    no page can use are dropped.
+    """
     captions: Dict[str, str] = {}
     with open(media_jsonl_path, "r", encoding="utf-8") as f:
         for line in f:
@@ -24,10 +43,35 @@ def load_media_captions(media_jsonl_path: str) -> Dict[str, str]:
             media_id = obj.get("media_id")
             caption = obj.get("caption")
             if isinstance(media_id, str) and isinstance(caption, str) and media_id:
+                if referenced is not None and not may_be_referenced(media_id, referenced):
+                    continue
                 captions[media_id] = caption
     return captions
 
 
+def may_be_referenced(media_id: str, referenced: Set[bytes]) -> bool:
+    # Pages are decoded with newline translation, so an id containing a
+    # newline may not appear byte for byte; keep those
+    if "\n" in media_id:
+        return True
+    try:
+        return media_id.encode("utf-8") in referenced
+    except UnicodeEncodeError:
+        return True
+
+
+def referenced_names(path: str) -> Set[bytes]:
+    """Every byte string a captioned image in this file could resolve to as a media id"""
+    if not may_need_captions(path):
+        return set()
+    with open(path, "rb") as f:
+        names = set(MEDIA_ID_DELIMITER_BYTES_REGEX.split(f.read()))
+    if os.name == "nt":
+        # os.path.basename("C:photo.png") drops the drive as well
+        names.update([os.path.splitdrive(name)[1] for name in names])
+    return names
+
+
 def is_images_path(src: str) -> bool:
     # Consider any path that contains '/images/' or starts with '/images' or 'images/'
     normalized = src.replace("\\", "/")
@@ -48,7 +92,7 @@ def escape_caption_for_jsx(value: str) -> str:
 
 def add_caption_to_frame_open_tag(open_tag: str, caption: str) -> str:
     # If caption already present, return unchanged
-    if re.search(r"\bcaption\s*=", open_tag):
+    if CAPTION_ATTR_REGEX.search(open_tag):
         return open_tag
     safe_caption = escape_caption_for_jsx(caption)
     # Insert before closing '>' while preserving spacing/formatting
@@ -57,45 +101,52 @@ def add_caption_to_frame_open_tag(open_tag: str, caption: str) -> str:
     return open_tag
 
 
-def process_frame_block(block: str, media_captions: Dict[str, str]) -> Tuple[str, bool]:
+def process_frame_block(match: re.Match, media_captions: Dict[str, str]) -> Tuple[str, bool]:
     """
-    Return (new_block, changed)
+    Return (new_block, changed) for a FRAME_BLOCK_REGEX match
     """
-    # Find first image src in the block that points to images folder
-    matches = list(IMG_SRC_REGEX.finditer(block))
-    if not matches:
+    block = match.group(0)
+    open_tag = match.group("open")
+    # A frame that already has a caption is left alone, so skip the image scan
+    if CAPTION_ATTR_REGEX.search(open_tag):
         return block, False
 
+    # Find first image src in the block that points to images folder, scanning
+    # the block in place rather than a copy of it
     matched_caption: str = ""
-    matched_idx: int = -1
-    for i, m in enumerate(matches):
+    for m in IMG_SRC_REGEX.finditer(match.string, match.start(), match.end()):
         src = m.group(1)
         if not is_images_path(src):
             continue
         media_id = os.path.basename(src.split("?")[0])  # drop querystring if present
-        if media_id in media_captions and media_captions[media_id]:
+        if media_captions.get(media_id):
             matched_caption = media_captions[media_id]
-            matched_idx = i
             break
 
-    if matched_idx == -1:
+    if not matched_caption:
         return block, False
 
-    # Extract open tag
-    open_tag_match = FRAME_OPEN_TAG_REGEX.search(block)
-    if not open_tag_match:
-        return block, False
-    open_tag = open_tag_match.group(0)
     new_open_tag = add_caption_to_frame_open_tag(open_tag, matched_caption)
     if new_open_tag == open_tag:
         return block, False
-    # Replace only this open tag occurrence
-    start, end = open_tag_match.span()
-    new_block = block[:start] + new_open_tag + block[end:]
-    return new_block, True
+    # Replace only the open tag, which starts the block
+    return new_open_tag + block[len(open_tag):], True
+
+
+def may_need_captions(path: str) -> bool:
+    # Most pages have no <Frame> around an <img>; check the raw bytes before decoding
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(b"<Frame") >= 0 and IMG_TAG_BYTES_REGEX.search(mm) is not None
+        except ValueError:  # empty file
+            return False
 
 
 def process_file(path: str, media_captions: Dict[str, str]) -> Tuple[bool, int]:
+    if not may_need_captions(path):
+        return False, 0
+
     with open(path, "r", encoding="utf-8") as f:
         original = f.read()
 
@@ -105,8 +156,7 @@ def process_file(path: str, media_captions: Dict[str, str]) -> Tuple[bool, int]:
     # Iterate over frame blocks
     def _replace(match: re.Match) -> str:
         nonlocal changed, replacements
-        block = match.group(0)
-        new_block, did_change = process_frame_block(block, media_captions)
+        new_block, did_change = process_frame_block(match, media_captions)
         if did_change:
             changed = True
             replacements += 1
@@ -115,18 +165,41 @@ def process_file(path: str, media_captions: Dict[str, str]) -> Tuple[bool, int]:
     new_content = FRAME_BLOCK_REGEX.sub(_replace, original)
 
     if changed and new_content != original:
-        with open(path, "w", encoding="utf-8", newline="") as f:
-            f.write(new_content)
+        write_atomic(path, new_content)
     return changed, replacements
 
 
+def write_atomic(path: str, content: str) -> None:
+    # Write a temporary sibling and rename it over the original, so a page is
+    # never left half-written if the run is interrupted
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, "w", encoding="utf-8", newline="") as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+# Captions for the files handled by this worker process, set once by the pool initializer
+_worker_captions: Dict[str, str] = {}
+
+
+def _init_worker(media_captions: Dict[str, str]) -> None:
+    global _worker_captions
+    _worker_captions = media_captions
+
+
+def _process_file_in_worker(path: str) -> Tuple[bool, int]:
+    return process_file(path, _worker_captions)
+
+
 def find_mdx_files(root: str) -> List[str]:
-    mdx_files: List[str] = []
-    for base, _dirs, files in os.walk(root):
-        for name in files:
-            if name.lower().endswith(".mdx"):
-                mdx_files.append(os.path.join(base, name))
-    return mdx_files
+    return list(iter_mdx(root))
 
 
 def main() -> None:
@@ -135,18 +208,27 @@ def main() -> None:
     parser.add_argument("--root", "-r", default=".", help="Root directory to scan for .mdx files")
     args = parser.parse_args()
 
-    media_captions = load_media_captions(args.media)
     mdx_files = find_mdx_files(args.root)
 
+    # Only keep captions some page could use; media.jsonl is usually far
+    # larger than the set of images the pages reference
+    referenced: Set[bytes] = set()
+    with concurrent.futures.ProcessPoolExecutor() as executor:
+        for names in executor.map(referenced_names, mdx_files, chunksize=16):
+            referenced.update(names)
+    media_captions = load_media_captions(args.media, referenced)
+
     total_files_changed = 0
     total_replacements = 0
 
-    for path in mdx_files:
-        changed, replacements = process_file(path, media_captions)
-        if changed:
-            total_files_changed += 1
-            total_replacements += replacements
-            print(f"Updated {path} ({replacements} frame{'s' if replacements != 1 else ''})")
+    # Files are independent; the captions are sent to each worker once rather than with every file
+    with concurrent.futures.ProcessPoolExecutor(initializer=_init_worker, initargs=(media_captions,)) as executor:
+        results = executor.map(_process_file_in_worker, mdx_files, chunksize=16)
+        for path, (changed, replacements) in zip(mdx_files, results):
+            if changed:
+                total_files_changed += 1
+                total_replacements += replacements
+                print(f"Updated {path} ({replacements} frame{'s' if replacements != 1 else ''})")
 
     print(f"Done. Files changed: {total_files_changed}. Frames updated: {total_replacements}.")
 
@@ -1,16 +1,51 @@
 import argparse
+import bisect
 import concurrent.futures
+import functools
 import json
 import os
+import sys
+import threading
 from pathlib import Path
 from typing import Dict, Iterable, List, Optional, Set, Tuple
 
 try:
     import boto3
+    from boto3.s3.transfer import TransferConfig
+    from botocore.config import Config
     from botocore.exceptions import ClientError
+    from s3transfer.manager import TransferManager
 except Exception:  # pragma: no cover
     boto3 = None
+    TransferConfig = None
+    Config = None
     ClientError = Exception
+    TransferManager = None
+
+try:
+    import orjson as _json_fast
+except ImportError:  # optional; stdlib json is used when unavailable
+    _json_fast = None
+
+# Shared helpers live at the repo root, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scan_tree import walk_entries
+
+
+# Destination directories already created by this process
+_created_dirs: Set[Path] = set()
+
+
+def loads_json(text: str):
+    # orjson when installed; lines it rejects (NaN, lone surrogates) go through
+    # json.loads so results and errors match the stdlib. orjson reads integers
+    # beyond 64 bits as floats, which media ids and extensions never are.
+    if _json_fast is not None:
+        try:
+            return _json_fast.loads(text)
+        except _json_fast.JSONDecodeError:
+            pass
+    return json.loads(text)
 
 
 def load_media_items(jsonl_path: Path) -> List[Dict]:
@@ -21,7 +56,7 @@ def load_media_items(jsonl_path: Path) -> List[Dict]:
             if not line:
                 continue
             try:
-                obj = json.loads(line)
+                obj = loads_json(line)
                 if isinstance(obj, dict) and obj.get("media_id"):
                     items.append(obj)
             except json.JSONDecodeError:
@@ -31,29 +66,72 @@ def load_media_items(jsonl_path: Path) -> List[Dict]:
     return items
 
 
-def build_local_stem_index(images_dir: Path) -> Set[str]:
-    stems: Set[str] = set()
-    for path in images_dir.rglob("*"):
-        if path.is_file():
-            stems.add(path.stem)
-    return stems
+class LocalImageIndex:
+    """Files under images_dir by name and by stem, from a single walk
+
+    Lookups return the file a fresh rglob scan would have found first: files
+    rank by their directory's place in the walk, then by listing order.
+    Downloads and moves update the index in place. The one approximation: a
+    file that lands in a directory during the run ranks after the files that
+    were already there (a fresh scan would use the filesystem's listing
+    order), which only matters when several files in one directory share a
+    name or stem.
+    """
+
+    def __init__(self, images_dir: Path) -> None:
+        self._lock = threading.Lock()
+        self._count = 0
+        # directory -> its place in walk order; one created during the run
+        # ranks after every walked directory
+        self._dir_rank: Dict[Path, int] = {}
+        # name/stem -> [((directory rank, arrival), path)] of every such file
+        self._by_name: Dict[str, List[Tuple[Tuple[int, int], Path]]] = {}
+        self._by_stem: Dict[str, List[Tuple[Tuple[int, int], Path]]] = {}
+        for directory, entries in walk_entries(images_dir):
+            self._dir_rank[Path(directory)] = len(self._dir_rank)
+            for entry in entries:
+                try:
+                    if entry.is_file():
+                        self._add(Path(entry.path))
+                except OSError:
+                    continue
+
+    def _add(self, path: Path) -> None:
+        dir_rank = self._dir_rank.setdefault(path.parent, len(self._dir_rank))
+        entry = ((dir_rank, self._count), path)
+        self._count += 1
+        self._by_name.setdefault(path.name, []).append(entry)
+        self._by_stem.setdefault(path.stem, []).append(entry)
+
+    @staticmethod
+    def _discard(index: Dict[str, List[Tuple[Tuple[int, int], Path]]], key: str, path: Path) -> None:
+        entries = [e for e in index.get(key, ()) if e[1] != path]
+        if entries:
+            index[key] = entries
+        else:
+            index.pop(key, None)
 
+    def find(self, media_id: str) -> Optional[Path]:
+        has_ext = "." in (media_id or "")
+        stem = media_id.rsplit(".", 1)[0] if has_ext else media_id
+        with self._lock:
+            found = list(self._by_stem.get(stem, ()))
+            if has_ext:
+                found.extend(self._by_name.get(media_id, ()))
+        return min(found)[1] if found else None
 
-def find_local_by_media_id(images_dir: Path, media_id: str) -> Optional[Path]:
-    has_ext = "." in (media_id or "")
-    stem = media_id.rsplit(".", 1)[0] if has_ext else media_id
-    for path in images_dir.rglob("*"):
-        if not path.is_file():
-            continue
-        if has_ext:
-            if path.name == media_id or path.stem == stem:
-                return path
-        else:
-            if path.stem == media_id:
-                return path
-    return None
+    def add(self, path: Path) -> None:
+        with self._lock:
+            self._add(path)
+
+    def move(self, source: Path, dest: Path) -> None:
+        with self._lock:
+            self._discard(self._by_name, source.name, source)
+            self._discard(self._by_stem, source.stem, source)
+            self._add(dest)
 
 
+@functools.lru_cache(maxsize=4096)
 def decide_namespace(source_article_id: str) -> str:
     lowered = (source_article_id or "").lower()
     if ":rediq:" in lowered:
@@ -66,20 +144,35 @@ def decide_namespace(source_article_id: str) -> str:
     return "radix"
 
 
+@functools.lru_cache(maxsize=None)
+def resolved_dir(directory: Path) -> Path:
+    # Destination roots are the same two directories for every item
+    return directory.resolve()
+
+
 def is_in_dir(child: Path, parent: Path) -> bool:
     try:
-        child.resolve().relative_to(parent.resolve())
+        # Files found directly in the destination only need an lstat, not a full resolve
+        if child.parent == parent and not child.is_symlink():
+            return True
+        child.resolve().relative_to(resolved_dir(parent))
         return True
     except Exception:
         return False
 
 
-def s3_client(region_name: Optional[str] = None):
+def s3_client(region_name: Optional[str] = None, max_workers: int = 0):
     if boto3 is None:
         raise RuntimeError(
             "boto3 is required. Install with: pip install boto3"
         )
-    return boto3.client("s3", region_name=region_name)
+    # One client is shared by every worker thread, so size its connection
+    # pool to keep them all busy
+    config = Config(
+        max_pool_connections=max(max_workers * 2, 32),
+        retries={"max_attempts": 5, "mode": "adaptive"},
+    )
+    return boto3.client("s3", region_name=region_name, config=config)
 
 
 def s3_head_object(client, bucket: str, key: str, verbose: bool = False) -> Optional[Dict]:
@@ -100,6 +193,111 @@ def s3_head_object(client, bucket: str, key: str, verbose: bool = False) -> Opti
         return None
 
 
+# The per-item listing fallback only looks at this many keys
+LIST_FALLBACK_MAX_KEYS = 25
+PREFERRED_EXT_ORDER = ["png", "jpg", "jpeg", "gif", "webp", "bmp"]
+
+
+def ext_candidates(ext: str) -> List[str]:
+    e = ext.lstrip(".")
+    normalized_exts = [e]
+    # Common alias handling
+    if e.lower() == "jpg":
+        normalized_exts.append("jpeg")
+    if e.lower() == "jpeg":
+        normalized_exts.append("jpg")
+    return normalized_exts
+
+
+def preferred_key(keys: List[str]) -> str:
+    def sort_key(k: str) -> Tuple[int, str]:
+        ext_found = k.rsplit(".", 1)[-1].lower() if "." in k else ""
+        try:
+            idx = PREFERRED_EXT_ORDER.index(ext_found)
+        except ValueError:
+            idx = len(PREFERRED_EXT_ORDER)
+        return (idx, k)
+    return min(keys, key=sort_key)
+
+
+class S3KeyIndex:
+    """Every key under a prefix, from one paginated listing
+
+    find() gives the same answer as s3_find_key_for_media without any
+    per-item requests.
+    """
+
+    def __init__(self, keys: List[str]) -> None:
+        # S3 lists keys in UTF-8 byte order, which matches str ordering
+        self._keys = sorted(keys)
+        self._key_set = set(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def find(self, prefix: str, media_id: str, ext: Optional[str]) -> Optional[str]:
+        id_has_ext = "." in (media_id or "")
+        if id_has_ext:
+            exact_key = f"{prefix}{media_id}"
+            if exact_key in self._key_set:
+                return exact_key
+
+        if not id_has_ext and ext:
+            for e2 in ext_candidates(ext):
+                key = f"{prefix}{media_id}.{e2}"
+                if key in self._key_set:
+                    return key
+
+        # Same window the per-item listing would have returned
+        list_prefix = f"{prefix}{media_id}"
+        if not id_has_ext:
+            list_prefix = f"{list_prefix}."
+        start = bisect.bisect_left(self._keys, list_prefix)
+        keys: List[str] = []
+        for key in self._keys[start:start + LIST_FALLBACK_MAX_KEYS]:
+            if not key.startswith(list_prefix):
+                break
+            keys.append(key)
+        return preferred_key(keys) if keys else None
+
+
+# Media ids are hex digests, so these split a large listing into 16 ranges of
+# similar size; any other key still falls into exactly one range
+LIST_SHARD_BOUNDARIES = "123456789abcdef"
+LIST_PAGE_SIZE = 1000
+
+
+def list_key_range(client, bucket: str, prefix: str, after: Optional[str], upto: Optional[str]) -> List[str]:
+    """Keys under prefix with after < key <= upto; a None bound is open"""
+    kwargs = {"Bucket": bucket, "Prefix": prefix, "PaginationConfig": {"PageSize": LIST_PAGE_SIZE}}
+    if after is not None:
+        kwargs["StartAfter"] = after
+    keys: List[str] = []
+    for page in client.get_paginator("list_objects_v2").paginate(**kwargs):
+        for obj in page.get("Contents", []):
+            key = obj["Key"]
+            if upto is not None and key > upto:
+                return keys
+            keys.append(key)
+    return keys
+
+
+def index_s3_prefix(client, bucket: str, prefix: str) -> S3KeyIndex:
+    first = client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=LIST_PAGE_SIZE)
+    keys = [obj["Key"] for obj in first.get("Contents", [])]
+    if first.get("IsTruncated"):
+        # More than one page: list disjoint key ranges concurrently, since each
+        # paginator has to wait for the previous page's continuation token
+        bounds: List[Optional[str]] = [None, *(prefix + c for c in LIST_SHARD_BOUNDARIES), None]
+        with concurrent.futures.ThreadPoolExecutor(max_workers=len(bounds) - 1) as executor:
+            shards = executor.map(
+                lambda bound: list_key_range(client, bucket, prefix, *bound),
+                zip(bounds, bounds[1:]),
+            )
+            keys = [key for shard in shards for key in shard]
+    return S3KeyIndex(keys)
+
+
 def s3_find_key_for_media(client, bucket: str, prefix: str, media_id: str, ext: Optional[str], verbose: bool = False) -> Optional[str]:
     # If media_id already contains an extension, try that exact key first
     id_has_ext = "." in (media_id or "")
@@ -112,20 +310,21 @@ def s3_find_key_for_media(client, bucket: str, prefix: str, media_id: str, ext:
 
     # Try direct match with provided ext (only if id didn't include it)
     if not id_has_ext and ext:
-        normalized_exts: List[str] = []
-        e = ext.lstrip(".")
-        normalized_exts = [e]
-        # Common alias handling
-        if e.lower() == "jpg":
-            normalized_exts.append("jpeg")
-        if e.lower() == "jpeg":
-            normalized_exts.append("jpg")
-        for e2 in normalized_exts:
-            key = f"{prefix}{media_id}.{e2}"
-            if verbose:
+        keys = [f"{prefix}{media_id}.{e2}" for e2 in ext_candidates(ext)]
+        if verbose:
+            for key in keys:
                 print(f"  - probing {key}")
-            if s3_head_object(client, bucket, key, verbose=verbose):
-                return key
+        if len(keys) == 1:
+            if s3_head_object(client, bucket, keys[0], verbose=verbose):
+                return keys[0]
+        else:
+            # The .jpg/.jpeg aliases are probed at once, so this takes one round
+            # trip rather than two; the first candidate in order that exists wins
+            with concurrent.futures.ThreadPoolExecutor(max_workers=len(keys)) as executor:
+                heads = [executor.submit(s3_head_object, client, bucket, key, verbose) for key in keys]
+            for key, head in zip(keys, heads):
+                if head.result():
+                    return key
 
     # Fallback: list by prefix and pick first
     list_prefix = f"{prefix}{media_id}"
@@ -134,20 +333,10 @@ def s3_find_key_for_media(client, bucket: str, prefix: str, media_id: str, ext:
     try:
         if verbose:
             print(f"  - listing with prefix {list_prefix}")
-        resp = client.list_objects_v2(Bucket=bucket, Prefix=list_prefix, MaxKeys=25)
+        resp = client.list_objects_v2(Bucket=bucket, Prefix=list_prefix, MaxKeys=LIST_FALLBACK_MAX_KEYS)
         contents = resp.get("Contents", [])
         if contents:
-            keys = [c["Key"] for c in contents]
-            preferred_ext_order = ["png", "jpg", "jpeg", "gif", "webp", "bmp"]
-            def sort_key(k: str) -> Tuple[int, str]:
-                ext_found = k.rsplit(".", 1)[-1].lower() if "." in k else ""
-                try:
-                    idx = preferred_ext_order.index(ext_found)
-                except ValueError:
-                    idx = len(preferred_ext_order)
-                return (idx, k)
-            keys.sort(key=sort_key)
-            return keys[0]
+            return preferred_key([c["Key"] for c in contents])
     except ClientError as e:
         if verbose:
             err = getattr(e, "response", {}).get("Error", {})
@@ -158,23 +347,51 @@ def s3_find_key_for_media(client, bucket: str, prefix: str, media_id: str, ext:
     return None
 
 
-def download_s3_object(client, bucket: str, key: str, dest_path: Path) -> None:
-    dest_path.parent.mkdir(parents=True, exist_ok=True)
-    client.download_file(bucket, key, str(dest_path))
+def ensure_dir(directory: Path) -> None:
+    # Items share a handful of namespace folders; mkdir each one only once
+    if directory not in _created_dirs:
+        directory.mkdir(parents=True, exist_ok=True)
+        _created_dirs.add(directory)
+
+
+def transfer_manager(client, max_workers: int):
+    """One TransferManager shared by every worker thread
+
+    client.download_file builds (and tears down) a TransferManager with its own
+    thread pool on every call; a shared one keeps those threads for the whole run.
+    """
+    config = TransferConfig(
+        multipart_threshold=8 * 1024 * 1024,
+        max_concurrency=max_workers,
+        io_chunksize=1024 * 1024,
+        max_io_queue=1000,
+    )
+    return TransferManager(client, config=config)
+
+
+def download_s3_object(manager, bucket: str, key: str, dest_path: Path) -> None:
+    ensure_dir(dest_path.parent)
+    manager.download(bucket, key, str(dest_path)).result()
 
 
 def ensure_ext_from_key(key: str) -> str:
     return f".{key.rsplit('.', 1)[-1]}" if "." in key else ""
 
 
+# Items submitted to the worker pool ahead of completion, per worker
+IN_FLIGHT_PER_WORKER = 4
+
+
 def process_item(
     item: Dict,
-    images_dir: Path,
+    local_index: LocalImageIndex,
     radix_dir: Path,
     rediq_dir: Path,
+    client,
+    manager,
+    s3_index: Optional[S3KeyIndex],
     bucket: str,
     prefix: str,
-    region_name: Optional[str],
     dry_run: bool,
     verbose: bool,
 ) -> Tuple[str, str]:
@@ -186,7 +403,7 @@ def process_item(
         return ("skipped", "Missing media_id")
 
     # Local check by stem across all of images
-    local_found = find_local_by_media_id(images_dir, media_id)
+    local_found = local_index.find(media_id)
     # Decide namespace for destination
     namespace = decide_namespace(source_article_id)
     dest_root = rediq_dir if namespace == "rediq" else radix_dir
@@ -196,19 +413,23 @@ def process_item(
             dest_path = dest_root / local_found.name
             if dry_run:
                 return ("would_move", f"{local_found} -> {dest_path}")
-            dest_path.parent.mkdir(parents=True, exist_ok=True)
+            ensure_dir(dest_path.parent)
             if dest_path.exists():
                 return (
                     "exists_but_wrong_namespace",
                     f"{local_found} should be {dest_path} (dest already exists)",
                 )
             local_found.rename(dest_path)
+            local_index.move(local_found, dest_path)
             return ("moved", f"{local_found} -> {dest_path}")
         return ("exists_local", str(local_found))
 
-
-    client = s3_client(region_name)
-    key = s3_find_key_for_media(client, bucket, prefix, media_id, ext, verbose=verbose)
+    if s3_index is not None:
+        key = s3_index.find(prefix, media_id, ext)
+        if verbose:
+            print(f"  - resolved {media_id} from listing: {key}")
+    else:
+        key = s3_find_key_for_media(client, bucket, prefix, media_id, ext, verbose=verbose)
     if not key:
         return ("missing_s3", f"{media_id}")
 
@@ -218,7 +439,8 @@ def process_item(
     if dry_run:
         return ("would_download", f"s3://{bucket}/{key} -> {dest_path}")
 
-    download_s3_object(client, bucket, key, dest_path)
+    download_s3_object(manager, bucket, key, dest_path)
+    local_index.add(dest_path)
     return ("downloaded", f"{dest_path}")
 
 
@@ -238,9 +460,14 @@ def run(
     radix_dir = images_dir / "radix"
     rediq_dir = images_dir / "rediq"
 
+    # Walk the images tree once; items look files up in this index
+    local_index = LocalImageIndex(images_dir)
+
+    # One client for the preflight and every worker; boto3 clients are thread-safe
+    client = s3_client(region_name, max_workers)
+
     # Preflight: verify bucket/prefix access
     try:
-        client = s3_client(region_name)
         probe = client.list_objects_v2(Bucket=bucket, Prefix=prefix, MaxKeys=1)
         count = probe.get("KeyCount", 0)
         first_key = (probe.get("Contents", [{}])[0] or {}).get("Key") if count else None
@@ -254,6 +481,17 @@ def run(
         if code in {"AccessDenied", "AccessForbidden", "Unauthorized"}:
             print("Hint: Your AWS credentials may not have s3:ListBucket permissions for this bucket/prefix.")
 
+    # Resolve every item against one listing of the prefix instead of probing
+    # S3 per item; without list access, fall back to the per-item probes
+    s3_index: Optional[S3KeyIndex] = None
+    if items:
+        try:
+            s3_index = index_s3_prefix(client, bucket, prefix)
+            print(f"Indexed {len(s3_index)} keys under s3://{bucket}/{prefix}")
+        except ClientError as e:
+            err = getattr(e, "response", {}).get("Error", {})
+            print(f"Could not list s3://{bucket}/{prefix} ({err.get('Code')}); probing S3 per item")
+
     results: Dict[str, int] = {
         "exists_local": 0,
         "downloaded": 0,
@@ -271,12 +509,14 @@ def run(
         try:
             status, detail = process_item(
                 item,
-                images_dir,
+                local_index,
                 radix_dir,
                 rediq_dir,
+                client,
+                manager,
+                s3_index,
                 bucket,
                 prefix,
-                region_name,
                 dry_run,
                 verbose,
             )
@@ -284,12 +524,23 @@ def run(
         except Exception as e:  # pragma: no cover
             return (media_id, "error", str(e))
 
-    with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [executor.submit(worker, item) for item in items]
-        for fut in concurrent.futures.as_completed(futures):
-            media_id, status, detail = fut.result()
-            results[status] = results.get(status, 0) + 1
-            print(f"[{status}] {media_id} - {detail}")
+    with transfer_manager(client, max_workers) as manager, \
+            concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+        # Keep a bounded window of items in flight rather than a future per item
+        pending: Set[concurrent.futures.Future] = set()
+        item_iter = iter(items)
+        while True:
+            for item in item_iter:
+                pending.add(executor.submit(worker, item))
+                if len(pending) >= max_workers * IN_FLIGHT_PER_WORKER:
+                    break
+            if not pending:
+                break
+            done, pending = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for fut in done:
+                media_id, status, detail = fut.result()
+                results[status] = results.get(status, 0) + 1
+                print(f"[{status}] {media_id} - {detail}")
 
     print("\nSummary:")
     for k, v in results.items():
@@ -1,9 +1,15 @@
 import json
+import mmap
 import os
 import re
+import sys
 from pathlib import Path
 from typing import Dict, Tuple
 
+# Shared helpers live at the repo root, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scan_tree import iter_files
+
 
 # Note: Not used directly; kept for reference if needed later
 ZENDESK_URL_PATTERN = re.compile(
@@ -11,6 +17,15 @@ ZENDESK_URL_PATTERN = re.compile(
 	 re.IGNORECASE,
 )
 
+# Compiled once and shared by every file
+IMAGE_FILENAME_PATTERN = re.compile(r"([A-Za-z0-9_\-]+\.(?:png|jpg|jpeg|gif))", re.IGNORECASE)
+IMG_TAG_PATTERN = re.compile(r"<img\s+[^>]*src=\"([^\"]+)\"", re.IGNORECASE)
+MD_IMG_PATTERN = re.compile(r"!\[([^\]]*)\]\(([^)]+)\)")
+LINKED_IMG_PATTERN = re.compile(r"\[!\[([^\]]*)\]\(([^)]+)\)\]\([^)]+\)")
+# Raw-byte prescan for the extensions IMAGE_FILENAME_PATTERN needs; its
+# case-insensitive "i" also matches the UTF-8 encoded dotted and dotless I
+IMAGE_EXT_BYTES_PATTERN = re.compile(rb"\.(?:png|jpe?g|g(?:i|\xc4[\xb0\xb1])f)", re.IGNORECASE)
+
 
 def load_media_map(media_jsonl_path: str) -> Dict[str, str]:
 	"""Load mapping of original_name (lowercase) -> media_id from media.jsonl."""
@@ -31,12 +46,29 @@ def load_media_map(media_jsonl_path: str) -> Dict[str, str]:
 	return media_map
 
 
+def may_reference_images(path: Path) -> bool:
+	"""Whether the raw bytes could hold a URL replace_urls_in_content rewrites
+
+	Every rewrite needs an image filename inside an src="..." attribute or a
+	![...](...) image, so pages without both are skipped before decoding.
+	"""
+	with open(path, "rb") as f:
+		try:
+			with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+				if mm.find(b'="') < 0 and mm.find(b"![") < 0:
+					return False
+				return IMAGE_EXT_BYTES_PATTERN.search(mm) is not None
+		except ValueError:  # empty file
+			return False
+
+
 def replace_urls_in_content(content: str, product: str, media_map: Dict[str, str]) -> Tuple[str, int]:
 	"""Replace Zendesk image URLs with local /images/<product>/<media_id> paths.
 
 	Returns updated content and number of replacements made.
 	"""
-	replacements = 0
+	# One-element list so the substitution callbacks can count without nonlocal
+	replacements = [0]
 
 	def repl_img_tag(match: re.Match) -> str:
 		filename = match.group(1)
@@ -50,54 +82,57 @@ def replace_urls_in_content(content: str, product: str, media_map: Dict[str, str
 		full = m.group(0)
 		url = m.group(1)
 		# Extract filename from URL
-		mfile = re.search(r"([A-Za-z0-9_\-]+\.(?:png|jpg|jpeg|gif))", url, re.IGNORECASE)
+		mfile = IMAGE_FILENAME_PATTERN.search(url)
 		if not mfile:
 			return full
 		filename = mfile.group(1)
 		media_id = media_map.get(filename.lower())
 		if not media_id:
 			return full
-		nonlocal replacements
-		replacements += 1
+		replacements[0] += 1
 		return full.replace(url, f"/images/{product}/{media_id}")
 
-	content = re.sub(r"<img\s+[^>]*src=\"([^\"]+)\"", img_src_sub, content, flags=re.IGNORECASE)
+	# Each pass runs on the previous pass's output, so they cannot be merged into
+	# one alternation scan; instead a pass is skipped when the literal text every
+	# one of its matches contains is absent
+	if '="' in content:
+		content = IMG_TAG_PATTERN.sub(img_src_sub, content)
 
 	# Markdown images ![alt](URL)
 	def md_img_sub(m: re.Match) -> str:
 		alt = m.group(1)
 		url = m.group(2)
-		mfile = re.search(r"([A-Za-z0-9_\-]+\.(?:png|jpg|jpeg|gif))", url, re.IGNORECASE)
+		mfile = IMAGE_FILENAME_PATTERN.search(url)
 		if not mfile:
 			return m.group(0)
 		filename = mfile.group(1)
 		media_id = media_map.get(filename.lower())
 		if not media_id:
 			return m.group(0)
-		nonlocal replacements
-		replacements += 1
+		replacements[0] += 1
 		return f"![{alt}](/images/{product}/{media_id})"
 
-	content = re.sub(r"!\[([^\]]*)\]\(([^)]+)\)", md_img_sub, content)
+	if "![" in content:
+		content = MD_IMG_PATTERN.sub(md_img_sub, content)
 
 	# Linked images: [![alt](URL)](URL2) -> ![alt](/images/...)
 	def linked_img_sub(m: re.Match) -> str:
 		alt = m.group(1)
 		inner_url = m.group(2)
-		mfile = re.search(r"([A-Za-z0-9_\-]+\.(?:png|jpg|jpeg|gif))", inner_url, re.IGNORECASE)
+		mfile = IMAGE_FILENAME_PATTERN.search(inner_url)
 		if not mfile:
 			return m.group(0)
 		filename = mfile.group(1)
 		media_id = media_map.get(filename.lower())
 		if not media_id:
 			return m.group(0)
-		nonlocal replacements
-		replacements += 1
+		replacements[0] += 1
 		return f"![{alt}](/images/{product}/{media_id})"
 
-	content = re.sub(r"\[!\[([^\]]*)\]\(([^)]+)\)\]\([^)]+\)", linked_img_sub, content)
+	if "[![" in content:
+		content = LINKED_IMG_PATTERN.sub(linked_img_sub, content)
 
-	return content, replacements
+	return content, replacements[0]
 
 
 def main():
@@ -110,11 +145,14 @@ def main():
 	media_map = load_media_map(args.media_jsonl)
 	root = Path(args.root)
 
-	mdx_files = list(root.rglob("*.mdx"))
+	# Same files and order as root.rglob("*.mdx")
+	mdx_files = [Path(p) for p in iter_files(root) if p.endswith(".mdx")]
 	total_changed = 0
 	total_replacements = 0
 	for mdx in mdx_files:
 		try:
+			if not may_reference_images(mdx):
+				continue
 			text = mdx.read_text(encoding="utf-8")
 		except Exception:
 			continue
@@ -1,139 +1,213 @@
 import argparse
+import concurrent.futures
+import functools
+import mmap
 import re
+import sys
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Optional, Tuple
+
+# Shared helpers live at the repo root, one level up
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+from scan_tree import iter_files
 
 
 IMG_SRC_HTML = re.compile(r"<img\s+[^>]*src=[\"\']([^\"\']+)[\"\']", re.IGNORECASE)
 IMG_SRC_MD = re.compile(r"!\[[^\]]*\]\(([^)]+)\)")
+# Raw-byte form of the "<img" that IMG_SRC_HTML needs; its case-insensitive "i"
+# also matches the UTF-8 encoded dotted and dotless I
+IMG_OPEN_BYTES = re.compile(rb"<(?:i|\xc4[\xb0\xb1])mg", re.IGNORECASE)
 
 
 def build_image_index(images_dir: Path) -> Dict[str, List[Path]]:
     index: Dict[str, List[Path]] = {}
-    for p in images_dir.rglob("*"):
-        if not p.is_file():
-            continue
+    for p in map(Path, iter_files(images_dir)):
         key = p.name.lower()
         index.setdefault(key, []).append(p)
     return index
 
 
+@functools.lru_cache(maxsize=None)
+def namespace_for_top_dir(top: str) -> str:
+    top = top.lower()
+    if top == "rediq":
+        return "rediq"
+    if top == "radix":
+        return "radix"
+    return "general"
+
+
 def expected_namespace_for_mdx(mdx_path: Path, root: Path) -> str:
     try:
         rel = mdx_path.relative_to(root)
-        top = rel.parts[0].lower()
-        if top == "rediq":
-            return "rediq"
-        if top == "radix":
-            return "radix"
+        return namespace_for_top_dir(rel.parts[0])
     except Exception:
         pass
     return "general"
 
 
-def validate_and_fix_content(
-    content: str,
+def rewrite_url(
+    url: str,
     images_dir: Path,
     image_index: Dict[str, List[Path]],
     mdx_namespace: str,
     prefer_actual_location: bool,
-) -> Tuple[str, int, int, int, List[str], List[str]]:
-    """Return (updated_content, fixed_count, still_missing, ambiguous, missing_urls, ambiguous_urls)."""
+) -> Tuple[str, bool, bool, bool]:
+    """Try to rewrite a single URL.
 
-    fixed = 0
-    missing = 0
-    ambiguous = 0
-    missing_urls: List[str] = []
-    ambiguous_urls: List[str] = []
-
-    def normalize_url(url: str) -> str:
-        return url.strip()
+    Returns: (new_url, did_fix, is_missing, is_ambiguous)
+    """
+    norm = url.strip()
+    if not norm.startswith(("/images/", "images/")):
+        return (url, False, False, False)
 
-    def rewrite_url(url: str) -> Tuple[str, bool, bool, bool]:
-        """Try to rewrite a single URL.
+    # Extract filename
+    filename = norm.rsplit("/", 1)[-1]
+    if not filename:
+        return (url, False, False, False)
 
-        Returns: (new_url, did_fix, is_missing, is_ambiguous)
-        """
-        norm = normalize_url(url)
-        if not (norm.startswith("/images/") or norm.startswith("images/")):
+    candidates = image_index.get(filename.lower(), [])
+    if len(candidates) == 0:
+        return (url, False, True, False)
+    if len(candidates) > 1:
+        # Prefer one under images/<mdx_namespace>/ if present
+        preferred = [p for p in candidates if f"/images/{mdx_namespace}/" in str(p.as_posix())]
+        chosen = preferred[0] if preferred else candidates[0]
+        # If multiple and not same namespace, mark ambiguous but still fix to chosen
+        chosen_rel = chosen.relative_to(images_dir).as_posix()
+        new_url = f"/images/{chosen_rel}"
+        return (new_url, True, False, True)
+
+    chosen = candidates[0]
+    chosen_rel = chosen.relative_to(images_dir).as_posix()
+    new_url = f"/images/{chosen_rel}"
+
+    # If prefer_actual_location is False and the URL already matches namespace, keep as-is
+    if not prefer_actual_location:
+        # Compare namespaces; only the first three segments are needed
+        parts = norm.split("/", 3)
+        current_ns = parts[2] if norm.startswith("/images/") and len(parts) >= 4 else None
+        actual_ns = chosen_rel.split("/")[0] if "/" in chosen_rel else None
+        if current_ns and actual_ns and current_ns == actual_ns:
             return (url, False, False, False)
 
-        # Extract filename
-        parts = norm.split("/")
-        filename = parts[-1]
-        if not filename:
-            return (url, False, False, False)
+    if new_url != norm:
+        return (new_url, True, False, False)
+    return (url, False, False, False)
 
-        candidates = image_index.get(filename.lower(), [])
-        if len(candidates) == 0:
-            return (url, False, True, False)
-        if len(candidates) > 1:
-            # Prefer one under images/<mdx_namespace>/ if present
-            preferred = [p for p in candidates if f"/images/{mdx_namespace}/" in str(p.as_posix())]
-            chosen = preferred[0] if preferred else candidates[0]
-            # If multiple and not same namespace, mark ambiguous but still fix to chosen
-            chosen_rel = chosen.relative_to(images_dir).as_posix()
-            new_url = f"/images/{chosen_rel}"
-            return (new_url, True, False, True)
-
-        chosen = candidates[0]
-        chosen_rel = chosen.relative_to(images_dir).as_posix()
-        new_url = f"/images/{chosen_rel}"
 
-        # If prefer_actual_location is False and the URL already matches namespace, keep as-is
-        if not prefer_actual_location:
-            # Compare namespaces
-            try:
-                current_ns = parts[2] if norm.startswith("/images/") and len(parts) >= 4 else None
-            except Exception:
-                current_ns = None
-            actual_ns = chosen_rel.split("/")[0] if "/" in chosen_rel else None
-            if current_ns and actual_ns and current_ns == actual_ns:
-                return (url, False, False, False)
-
-        if new_url != norm:
-            return (new_url, True, False, False)
-        return (url, False, False, False)
+def validate_and_fix_content(
+    content: str,
+    images_dir: Path,
+    image_index: Dict[str, List[Path]],
+    mdx_namespace: str,
+    prefer_actual_location: bool,
+) -> Tuple[str, int, int, int, List[str], List[str]]:
+    """Return (updated_content, fixed_count, still_missing, ambiguous, missing_urls, ambiguous_urls).
 
-    def sub_html(m: re.Match) -> str:
-        nonlocal fixed, missing, ambiguous
-        url = m.group(1)
-        new_url, did_fix, is_missing, is_ambiguous = rewrite_url(url)
-        if is_missing:
-            missing += 1
-            missing_urls.append(url)
-        if is_ambiguous:
-            ambiguous += 1
-            ambiguous_urls.append(url)
-        if did_fix:
-            fixed += 1
-            return m.group(0).replace(url, new_url)
-        return m.group(0)
+    The counts include repeats; the URL lists hold each URL once, in first-seen order.
+    """
+
+    fixed = 0
+    missing = 0
+    ambiguous = 0
+    # Insertion-ordered dicts used as ordered sets
+    missing_urls: Dict[str, None] = {}
+    ambiguous_urls: Dict[str, None] = {}
 
-    def sub_md(m: re.Match) -> str:
+    # Shared by both passes; the URL is group 1 of either pattern
+    def sub_link(m: re.Match) -> str:
         nonlocal fixed, missing, ambiguous
         url = m.group(1)
-        new_url, did_fix, is_missing, is_ambiguous = rewrite_url(url)
+        new_url, did_fix, is_missing, is_ambiguous = rewrite_url(
+            url, images_dir, image_index, mdx_namespace, prefer_actual_location
+        )
         if is_missing:
             missing += 1
-            missing_urls.append(url)
+            missing_urls[url] = None
         if is_ambiguous:
             ambiguous += 1
-            ambiguous_urls.append(url)
+            ambiguous_urls[url] = None
         if did_fix:
             fixed += 1
             return m.group(0).replace(url, new_url)
         return m.group(0)
 
-    updated = IMG_SRC_HTML.sub(sub_html, content)
-    updated = IMG_SRC_MD.sub(sub_md, updated)
-    return updated, fixed, missing, ambiguous, missing_urls, ambiguous_urls
+    # The markdown pass runs on the HTML pass's output and URLs are reported in
+    # pass order, so the passes stay separate; each is skipped when text every
+    # one of its matches contains is absent
+    updated = IMG_SRC_HTML.sub(sub_link, content) if "<" in content else content
+    if "![" in updated:
+        updated = IMG_SRC_MD.sub(sub_link, updated)
+    return updated, fixed, missing, ambiguous, list(missing_urls), list(ambiguous_urls)
+
+
+# Below this many pages, starting worker processes costs more than it saves
+POOL_MIN_FILES = 200
+
+
+def may_have_image_links(mdx: Path) -> bool:
+    # Most pages have no images; check the raw bytes before decoding
+    with open(mdx, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                return mm.find(b"![") >= 0 or IMG_OPEN_BYTES.search(mm) is not None
+        except ValueError:  # empty file
+            return False
+
+
+def process_mdx(
+    mdx: Path,
+    root: Path,
+    images_dir: Path,
+    image_index: Dict[str, List[Path]],
+    write: bool,
+    prefer_actual_location: bool,
+) -> Optional[Tuple[bool, int, int, int, List[str], List[str]]]:
+    """Validate one page, writing it back when asked.
+
+    Returns (changed, fixed, missing, ambiguous, missing_urls, ambiguous_urls),
+    or None if the page could not be read.
+    """
+    try:
+        if not may_have_image_links(mdx):
+            return False, 0, 0, 0, [], []
+        content = mdx.read_text(encoding="utf-8")
+    except Exception:
+        return None
+    mdx_ns = expected_namespace_for_mdx(mdx, root)
+    updated, fixed, missing, ambiguous, missing_urls, ambiguous_urls = validate_and_fix_content(
+        content,
+        images_dir,
+        image_index,
+        mdx_ns,
+        prefer_actual_location,
+    )
+    changed = fixed > 0 and updated != content
+    if changed and write:
+        mdx.write_text(updated, encoding="utf-8")
+    return changed, fixed, missing, ambiguous, missing_urls, ambiguous_urls
+
+
+# Arguments shared by every page in this worker process, set once by the pool initializer
+_worker_args: Tuple = ()
+
+
+def _init_worker(*args) -> None:
+    global _worker_args
+    _worker_args = args
+
+
+def _process_mdx_in_worker(mdx: Path) -> Optional[Tuple[bool, int, int, int, List[str], List[str]]]:
+    root, images_dir, image_index, write, prefer_actual_location = _worker_args
+    return process_mdx(mdx, root, images_dir, image_index, write, prefer_actual_location)
 
 
 def run(root: Path, images_dir: Path, write: bool, prefer_actual_location: bool) -> None:
     image_index = build_image_index(images_dir)
 
-    mdx_files = list(root.rglob("*.mdx"))
+    # Same files and order as root.rglob("*.mdx")
+    mdx_files = [Path(p) for p in iter_files(root) if p.endswith(".mdx")]
     total_fixed = 0
     total_missing = 0
     total_ambiguous = 0
@@ -141,43 +215,28 @@ def run(root: Path, images_dir: Path, write: bool, prefer_actual_location: bool)
     missing_by_file: Dict[Path, List[str]] = {}
     ambiguous_by_file: Dict[Path, List[str]] = {}
 
-    for mdx in mdx_files:
-        try:
-            content = mdx.read_text(encoding="utf-8")
-        except Exception:
+    # Pages are independent and the rewrite is regex work, so large trees are
+    # spread over processes; the index is sent to each worker once
+    shared = (root, images_dir, image_index, write, prefer_actual_location)
+    if len(mdx_files) < POOL_MIN_FILES:
+        results: List = [process_mdx(mdx, *shared) for mdx in mdx_files]
+    else:
+        with concurrent.futures.ProcessPoolExecutor(initializer=_init_worker, initargs=shared) as executor:
+            results = list(executor.map(_process_mdx_in_worker, mdx_files, chunksize=16))
+
+    for mdx, result in zip(mdx_files, results):
+        if result is None:
             continue
-        mdx_ns = expected_namespace_for_mdx(mdx, root)
-        updated, fixed, missing, ambiguous, missing_urls, ambiguous_urls = validate_and_fix_content(
-            content,
-            images_dir,
-            image_index,
-            mdx_ns,
-            prefer_actual_location,
-        )
-        if fixed > 0 and updated != content:
+        changed, fixed, missing, ambiguous, missing_urls, ambiguous_urls = result
+        if changed:
             changed_files += 1
-            if write:
-                mdx.write_text(updated, encoding="utf-8")
         total_fixed += fixed
         total_missing += missing
         total_ambiguous += ambiguous
         if missing_urls:
-            # Deduplicate while preserving order
-            seen = set()
-            deduped = []
-            for u in missing_urls:
-                if u not in seen:
-                    seen.add(u)
-                    deduped.append(u)
-            missing_by_file[mdx] = deduped
+            missing_by_file[mdx] = missing_urls
         if ambiguous_urls:
-            seen_a = set()
-            deduped_a = []
-            for u in ambiguous_urls:
-                if u not in seen_a:
-                    seen_a.add(u)
-                    deduped_a.append(u)
-            ambiguous_by_file[mdx] = deduped_a
+            ambiguous_by_file[mdx] = ambiguous_urls
 
     print(f"Files changed: {changed_files}")
     print(f"Links fixed: {total_fixed}")